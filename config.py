@@ -28,12 +28,18 @@ HAS_IMAGE_GENERATION = True
 DEFAULT_INPUT_DIR = "guides"
 DEFAULT_OUTPUT_DIR = "fiches"
 TOC_CACHE_DIR = "toc_cache"
-RATINGS_FILE = os.path.join("data", "ratings.json")
+RATINGS_FILE = os.path.join("data", "ratings.jsonl")
+# Ratings were stored as one JSON array before the move to JSON Lines
+LEGACY_RATINGS_FILE = os.path.join("data", "ratings.json")
 TABLE_OF_CONTENTS_PAGES = 5
 CLASS_LEVELS = [
     "cp", "ce1", "ce2", "cm1", "cm2", "6e",
     "7e", "8e", "9e"
 ]
+SUBJECTS = (
+    "", "Mathématiques", "Sciences", "Français", "Histoire",
+    "Géographie", "Éducation civique", "Arabe", "Anglais", "Islamique"
+)
 
 # Default model names
 DEFAULT_PRO_MODEL = "gemini-2.5-pro"
@@ -310,26 +316,9 @@ def get_configured_gemma_syntax_model():
 
 def save_rating_record(record):
     """Save a rating record to the ratings file"""
-    try:
-        os.makedirs(os.path.dirname(RATINGS_FILE), exist_ok=True)
-        
-        ratings = []
-        if os.path.exists(RATINGS_FILE):
-            try:
-                with open(RATINGS_FILE, 'r', encoding='utf-8') as f:
-                    ratings = json.load(f)
-            except json.JSONDecodeError:
-                pass
-        
-        ratings.append(record)
-        
-        with open(RATINGS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(ratings, f, indent=2, ensure_ascii=False)
-            
-        return True
-    except Exception as e:
-        print(f"Error saving rating: {e}")
-        return False
+    # The ratings store lives in utils.helpers, which itself imports this module
+    from utils.helpers import save_rating_record as _save_rating_record
+    return _save_rating_record(record)
 
 def _clamp_temperature(val):
     """Ensure temperature is between 0.0 and 1.0"""
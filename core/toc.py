@@ -284,9 +284,9 @@ def detect_page_offset(pdf_path: str, queue) -> int:
                 queue.put(("log", "⚠️ No content pages found for offset detection. Assuming no offset."))
                 return 0
 
-            pages_text = ""
-            for info in sample_pages:
-                pages_text += f"\n--- PDF Page {info['pdf_page_number']} ---\n{info['text']}\n"
+            pages_text = "".join(
+                f"\n--- PDF Page {info['pdf_page_number']} ---\n{info['text']}\n" for info in sample_pages
+            )
 
             prompt = f"""You are a page numbering expert. Detect the offset between logical page numbers and physical PDF page positions.
 
@@ -574,7 +574,7 @@ def find_textbook_file(class_level, textbook_dir, queue):
 
 
 def extract_lesson_text(pdf_path, page_numbers, queue, cancel_event=None):
-    lesson_text = ""
+    lesson_parts = []
     try:
         with pdfplumber.open(pdf_path) as pdf:
             for page_num in page_numbers:
@@ -585,11 +585,11 @@ def extract_lesson_text(pdf_path, page_numbers, queue, cancel_event=None):
                     page = pdf.pages[page_num - 1]
                     text = page.extract_text()
                     if text:
-                        lesson_text += f"\n\n--- TEXT FROM PAGE {page_num} ---\n\n{text}"
+                        lesson_parts.append(f"\n\n--- TEXT FROM PAGE {page_num} ---\n\n{text}")
                 else:
                     queue.put(("log", f"⚠️ Warning: Page {page_num} is out of bounds."))
         queue.put(("log", "✅ Lesson text extracted."))
-        return lesson_text
+        return "".join(lesson_parts)
     except Exception as e:
         queue.put(("log", f"❌ PDF Extraction Error: {e}"))
         return None
@@ -2,6 +2,7 @@ import os
 import json
 import threading
 import time
+import traceback
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
@@ -11,7 +12,7 @@ from config import (
     DEFAULT_INPUT_DIR, DEFAULT_OUTPUT_DIR, API_KEYS,
     get_configured_fiche_prompt, get_configured_flash_model,
     get_configured_pro_model, HAS_IMAGE_GENERATION, HAS_DOCX,
-    get_configured_page_finding_prompt, GEMINI_TOC_MODEL
+    get_configured_page_finding_prompt, GEMINI_TOC_MODEL, RATINGS_FILE
 )
 from core.ai import (
     generate_with_fallback, _fiche_response_schema, _parse_structured_response,
@@ -27,7 +28,7 @@ from core.toc import (
 from core.image_gen import (
     generate_fiche_illustration, generate_evaluation_illustrations, image_to_base64
 )
-from utils.helpers import get_top_rated_examples
+from utils.helpers import get_top_rated_examples, skipped_rating_lines
 from core.model_fetcher import fetch_available_models, find_best_models_with_ai
 
 # --- QThread worker that bridges queue events to Qt signals ---
@@ -63,7 +64,7 @@ class QueueProxy:
             except Exception:
                 pass
 
-def build_examples_block(use_top_rated: bool):
+def build_examples_block(use_top_rated: bool, queue=None):
     builtin_example = """
 ## EXEMPLE DE STYLE (référence de style et pas de format)
 ## EXEMPLE DE STYLE n1
@@ -140,6 +141,8 @@ Proposer aux élèves d'effectuer les exercices 3 et 4 à la maison.
 
     if use_top_rated:
         top = get_top_rated_examples(n=2)
+        if queue is not None and skipped_rating_lines():
+            queue.put(("log", f"⚠️ {skipped_rating_lines()} corrupt rating line(s) skipped in {RATINGS_FILE}"))
         for i, ex in enumerate(top, start=1):
             parts.append(f"""
 ## EXEMPLE TOP-RATED #{i} — {ex.get('class_level','').upper()} — {ex.get('topic','')}
@@ -155,7 +158,7 @@ def generate_fiche_from_text(lesson_text, lesson_topic, class_level, queue, temp
 
     queue.put(("log", "Génération de la fiche..."))
 
-    examples_block = build_examples_block(use_top_rated_examples)
+    examples_block = build_examples_block(use_top_rated_examples, queue)
 
     # Build structure dynamically with subject and duration
     duree = max(10, int(duration_minutes or 45))
@@ -390,7 +393,7 @@ def pipeline_run(class_level, lesson_topic, queue, pages_override: str, temperat
             
             # Generate the prompt that would be sent to AI
             queue.put(("log", "🔧 Generating preview prompt..."))
-            examples_block = build_examples_block(use_top_rated_examples)
+            examples_block = build_examples_block(use_top_rated_examples, queue)
             duree = max(10, int(duration_minutes or 45))
             
             fiche_structure = f"""
@@ -645,7 +648,6 @@ class EvaluationWorker(QtCore.QThread):
                         
                 except Exception as e:
                     queue.put(("log", f"❌ Error extracting content for '{topic}': {e}"))
-                    import traceback
                     queue.put(("log", f"Traceback: {traceback.format_exc()[:200]}"))  # Log first 200 chars of traceback
             
             # Combine all extracted texts
@@ -698,7 +700,7 @@ class EvaluationWorker(QtCore.QThread):
                 return
                 
             # Build evaluation prompt with extracted content
-            evaluation_prompt = self._build_evaluation_prompt(combined_text)
+            evaluation_prompt = self._build_evaluation_prompt(combined_text, queue)
             queue.put(("progress", 30))
             
             if self.cancel_event.is_set():
@@ -784,16 +786,16 @@ class EvaluationWorker(QtCore.QThread):
                                 queue.put(("log", f"✅ Generated {len(generated_images)} image(s)"))
                                 
                                 # Embed images in the evaluation content
-                                images_markdown = "\n\n---\n\n## 📸 Illustrations\n\n"
+                                image_parts = [evaluation_content, "\n\n---\n\n## 📸 Illustrations\n\n"]
                                 for idx, img_data in enumerate(generated_images, 1):
                                     try:
                                         base64_img = image_to_base64(img_data)
-                                        images_markdown += f"![Illustration {idx}](data:image/png;base64,{base64_img})\n\n"
+                                        image_parts.append(f"![Illustration {idx}](data:image/png;base64,{base64_img})\n\n")
                                     except Exception as e:
                                         queue.put(("log", f"⚠️ Failed to embed image {idx}: {e}"))
                                 
                                 # Append images to the evaluation content
-                                evaluation_content += images_markdown
+                                evaluation_content = "".join(image_parts)
                                 queue.put(("log", "✅ Images embedded in evaluation"))
                             else:
                                 queue.put(("log", "⚠️ No images were generated"))
@@ -820,12 +822,11 @@ class EvaluationWorker(QtCore.QThread):
                 queue.put(("log", "⏹️ Generation cancelled by user."))
             else:
                 queue.put(("log", f"❌ Evaluation Generation Error: {e}"))
-                import traceback
                 queue.put(("log", f"Stack trace: {traceback.format_exc()}"))
         finally:
             queue.put(("enable_buttons", None))
 
-    def _build_evaluation_prompt(self, extracted_content: str = "") -> str:
+    def _build_evaluation_prompt(self, extracted_content: str = "", queue=None) -> str:
         """
         Build a pedagogically sound evaluation prompt with comprehensive guidance.
         """
@@ -836,7 +837,7 @@ class EvaluationWorker(QtCore.QThread):
 
         # Build examples block (tone/style), reused from fiche generation
         try:
-            examples_block = build_examples_block(use_top_examples)
+            examples_block = build_examples_block(use_top_examples, queue)
         except Exception:
             examples_block = ""  # Fallback silently if anything goes wrong
 
@@ -1555,7 +1556,6 @@ class QuizWorker(QtCore.QThread):
                 queue.put(("log", "⏹️ Quiz generation cancelled"))
             else:
                 queue.put(("log", f"❌ Quiz Generation Error: {e}"))
-                import traceback
                 queue.put(("log", f"Stack trace: {traceback.format_exc()}"))
         finally:
             queue.put(("enable_buttons", None))
@@ -1685,6 +1685,22 @@ class GenerationWorker(QtCore.QThread):
             self.use_student_textbook
         )
 
+class ExportWorker(QtCore.QThread):
+    """Runs a PDF/DOCX export off the GUI thread. export(queue) saves and returns the path."""
+    log = QtCore.pyqtSignal(str)
+    export_done = QtCore.pyqtSignal(str, str, str)  # path, error, traceback
+
+    def __init__(self, export):
+        super().__init__()
+        self.export = export
+
+    def run(self):
+        try:
+            path = self.export(QueueProxy(self))
+            self.export_done.emit(path or "", "", "")
+        except Exception as e:
+            self.export_done.emit("", str(e), traceback.format_exc())
+
 class ModelUpdateWorker(QtCore.QThread):
     """
     Background worker to check for newer Gemini models using Gemma-3-27b analysis.
@@ -746,7 +746,7 @@ def generate_smart_filename(prefix, topic, class_level, output_dir, extension):
             return counter_filename
         counter += 1
 
-def save_fiche_to_pdf(content, lesson_topic, class_level, output_dir, queue, template_name: str | None = "Normal", subject: str | None = None):
+def save_fiche_to_pdf(content, lesson_topic, class_level, output_dir, queue, template_name: str | None = "Normal", subject: str | None = None, show_meta: bool | None = None):
     """Save fiche content as PDF using ReportLab"""
     try:
         os.makedirs(output_dir, exist_ok=True)
@@ -754,6 +754,9 @@ def save_fiche_to_pdf(content, lesson_topic, class_level, output_dir, queue, tem
         # Get template configuration - ensure template_name is a string
         template_key = template_name if template_name is not None else "Normal"
         template = PDF_TEMPLATES.get(template_key, PDF_TEMPLATES["Normal"])
+        if show_meta is not None:
+            # Per-export override on a copy; the shared template stays untouched
+            template = dict(template, show_meta_banner=show_meta)
         
         # Create smart filename that doesn't overwrite
         filename = generate_smart_filename("Fiche", lesson_topic, class_level, output_dir, "pdf")
@@ -799,7 +802,7 @@ def save_fiche_to_pdf(content, lesson_topic, class_level, output_dir, queue, tem
         queue.put(("log", f"❌ PDF Save Error: {e}"))
         return None
 
-def save_evaluation_to_pdf(content, topics_list, class_level, output_dir, queue, template_name: str | None = "Normal", subject: str | None = None):
+def save_evaluation_to_pdf(content, topics_list, class_level, output_dir, queue, template_name: str | None = "Normal", subject: str | None = None, show_meta: bool | None = None):
     """Save evaluation content as PDF using ReportLab"""
     try:
         os.makedirs(output_dir, exist_ok=True)
@@ -807,6 +810,9 @@ def save_evaluation_to_pdf(content, topics_list, class_level, output_dir, queue,
         # Get template configuration
         template_key = template_name if template_name is not None else "Normal"
         template = PDF_TEMPLATES.get(template_key, PDF_TEMPLATES["Normal"])
+        if show_meta is not None:
+            # Per-export override on a copy; the shared template stays untouched
+            template = dict(template, show_meta_banner=show_meta)
         
         # Create smart filename for evaluation
         topics_text = "_".join(topics_list[:2])  # Use first 2 topics to keep filename reasonable
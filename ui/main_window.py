@@ -1,5 +1,11 @@
 import os
 import json
+import functools
+import gzip
+import queue
+import threading
+import traceback
+from collections import deque
 from datetime import datetime
 from PyQt6 import QtWidgets, QtCore, QtGui
 from PyQt6.QtGui import QAction
@@ -11,31 +17,191 @@ from config import (
     DEFAULT_INPUT_DIR,
     DEFAULT_OUTPUT_DIR,
     CLASS_LEVELS,
+    SUBJECTS,
     API_KEYS,
     HAS_IMAGE_GENERATION,
     HAS_DOCX,
     ICON_PATH,
     tr,
     set_language,
-    get_configured_pro_model,
-    get_configured_flash_model,
-    load_api_keys_from_settings,
-    save_rating_record
+    load_api_keys_from_settings
 )
-from core.workers import GenerationWorker, EvaluationWorker, QuizWorker, ModelUpdateWorker
+from core.workers import GenerationWorker, EvaluationWorker, QuizWorker, ModelUpdateWorker, ExportWorker
 from core.toc import find_guide_file, get_cached_toc
 from document.pdf import save_fiche_to_pdf, save_evaluation_to_pdf
 from document.docx import save_fiche_to_docx, save_evaluation_to_docx
 from ui.preferences import PreferencesDialog
+from utils.helpers import save_rating_record
 
 PYQT6 = True
 
+# Folder picker flags, resolved once for the Qt binding in use
+FILEMODE_DIR = QtWidgets.QFileDialog.FileMode.Directory if PYQT6 else QtWidgets.QFileDialog.Directory
+OPT_SHOWDIRSONLY = QtWidgets.QFileDialog.Option.ShowDirsOnly if PYQT6 else QtWidgets.QFileDialog.ShowDirsOnly
+OPT_DONTRESOLVESYMLINKS = QtWidgets.QFileDialog.Option.DontResolveSymlinks if PYQT6 else QtWidgets.QFileDialog.DontResolveSymlinks
+
+# Help pages are shipped as HTML files next to this module and read on first open.
+# Packaged builds may ship them gzipped (gzip -9 ui/resources/help/*.html).
+_HELP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "help")
+
+# Help menu sections: name -> (dialog title, page file in _HELP_DIR)
+HELP_SECTIONS = {
+    "usage": ("Guide d'utilisation", "usage.html"),
+    "advanced": ("Fonctionnalités avancées", "advanced.html"),
+    "api": ("Configuration API", "api.html"),
+    "troubleshooting": ("Résolution de problèmes", "troubleshooting.html"),
+    "tips": ("Conseils et astuces", "tips.html"),
+    "about": ("À propos de FicheGen", "about.html"),
+}
+
+# append_log batches lines and flushes them on this timer, or sooner once the buffer fills
+_LOG_FLUSH_INTERVAL_MS = 150
+_LOG_BUF_MAX_LINES = 200
+# The log view drops its oldest lines beyond this many
+_LOG_MAX_BLOCKS = 5000
+# Run logs are block-buffered and only flushed to disk when the run ends
+_LOG_FILE_BUFFERING = 64 * 1024
+
+# Width the help pages are laid out at; the help browser wraps at this fixed width too
+_HELP_TEXT_WIDTH = 800
+
+@functools.lru_cache(maxsize=None)
+def _load_help(filename: str) -> str:
+    """Return a bundled help page (or help.css), reading it from disk only once."""
+    path = os.path.join(_HELP_DIR, filename)
+    try:
+        with open(path + ".gz", "rb") as f:
+            return gzip.decompress(f.read()).decode("utf-8")
+    except FileNotFoundError:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+@functools.lru_cache(maxsize=16)
+def _ensure_dir(path: str) -> str:
+    """Create path if it is missing; remembered for the session so later runs skip the syscalls."""
+    os.makedirs(path, exist_ok=True)
+    return path
+
+@functools.lru_cache(maxsize=8)
+def _mono_font(size: int):
+    """Monospace font for the preview dialogs, resolved once per size."""
+    return QtGui.QFont("monospace", size)
+
+class _LogQueue:
+    """queue stand-in for helpers called on the GUI thread: forwards "log" messages to sink, if any."""
+    def __init__(self, sink=None):
+        self.sink = sink
+
+    def put(self, item):
+        try:
+            kind, payload = item[0], item[1]
+            if kind == "log" and self.sink is not None:
+                self.sink(payload)
+        except Exception:
+            pass
+
+# Queued after a batch of writes: the settings writer flushes its QSettings to disk
+_SETTINGS_SYNC = object()
+
+class _QueuedSettings:
+    """QSettings stand-in for PreferencesDialog.save_to_settings: sends writes to the window's settings writer."""
+    def __init__(self, window):
+        self.window = window
+
+    def setValue(self, key, value):
+        self.window._set_setting(key, value)
+
+    def sync(self):
+        self.window._settings_writer_queue.put(_SETTINGS_SYNC)
+
+def _has_text(text: str) -> bool:
+    """True if text has any non-whitespace character; stops at the first one instead of copying like strip()."""
+    return bool(text) and not text.isspace()
+
+# Texts longer than this are inserted piecewise by _set_plain_text_chunked
+_TEXT_CHUNK = 64 * 1024
+
+def _set_plain_text_chunked(widget, text: str):
+    """setPlainText for large texts: insert in chunks with repaints and undo tracking off."""
+    if len(text) <= _TEXT_CHUNK:
+        widget.setPlainText(text)
+        return
+    doc = widget.document()
+    widget.setUpdatesEnabled(False)
+    doc.setUndoRedoEnabled(False)
+    try:
+        widget.clear()
+        cursor = QtGui.QTextCursor(doc)
+        cursor.beginEditBlock()
+        for i in range(0, len(text), _TEXT_CHUNK):
+            cursor.insertText(text[i:i + _TEXT_CHUNK])
+        cursor.endEditBlock()
+        widget.moveCursor(QtGui.QTextCursor.MoveOperation.Start)
+    finally:
+        doc.setUndoRedoEnabled(True)
+        widget.setUpdatesEnabled(True)
+
+# First PDF template, the fallback style when none has been chosen
+_DEFAULT_PDF_TEMPLATE = next(iter(PDF_TEMPLATES))
+
+# Settings read while building the window and when starting a run, with the defaults
+# used when a key is unset. Read once into MainWindow._settings_cache instead of hitting
+# QSettings per widget or per Generate click.
+_SETTINGS_DEFAULTS = {
+    "custom_pro_model": DEFAULT_PRO_MODEL,
+    "custom_flash_model": DEFAULT_FLASH_MODEL,
+    "gemini_use_pro": "true",
+    "enable_model_fallback": "true",
+    "temperature": "0.5",
+    "default_duration": "45",
+    "default_pdf_style": _DEFAULT_PDF_TEMPLATE,
+    "preview_source": "false",
+    "use_student_textbook": "false",
+    "generate_fiche_images": "false",
+    "generate_eval_images": "false",
+    "eval_images_count": "2",
+    "eval_school_name": "Groupe Scolaire",
+    "eval_academic_year": "2025/2026",
+    "eval_number": "1",
+    "eval_semester": "1",
+    "eval_max_score": "10",
+    "ui_compact_sidebar": "false",
+    "input_dir": DEFAULT_INPUT_DIR,
+    "output_dir": DEFAULT_OUTPUT_DIR,
+    "textbook_dir": "",
+    "use_top_examples": "true",
+    "special_instructions": "",
+    "save_logs": "false",
+    "default_subject": "",
+    "pdf_show_meta": "false",
+    "class_level": "cm2",
+    "topic": "",
+    "pages": "",
+    # None: fall back to default_duration / default_subject / nothing to restore
+    "duration": None,
+    "subject": None,
+    "window_geometry": None,
+    "splitter_state": None,
+}
+
 class MainWindow(QtWidgets.QMainWindow):
+    # Emitted from the settings writer thread with a log line when a write fails
+    _settings_write_failed = QtCore.pyqtSignal(str)
+
     def __init__(self):
         super().__init__()
         
         # Settings persistence
         self.settings = QtCore.QSettings("FicheGen", "Pedago")
+        # All writes, the preferences dialog included, go through _set_setting to a background
+        # thread with its own QSettings object; reads outside _settings_cache call
+        # _wait_for_settings_writes first
+        self._settings_writer_queue = queue.Queue()
+        self._settings_write_failed.connect(self.append_log)
+        self._settings_writer = threading.Thread(target=self._settings_writer_loop, name="settings-writer", daemon=True)
+        self._settings_writer.start()
+        self._settings_cache = {}
+        self._reload_settings_cache()
         
         # Load language setting first
         lang_code = self.settings.value("ui_language", "fr")  # Default to French
@@ -51,8 +217,36 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.worker = None
         self.current_content = ""
+        # Save buttons and rating start disabled; _update_save_states tracks their state
+        self._save_state = False
+        self._docx_enabled = bool(HAS_DOCX)
         self.log_file_handle = None
+        # Log lines waiting to be flushed to the log view and log file
+        self._log_buf = deque()
+        self._log_flush_timer = QtCore.QTimer(self)
+        self._log_flush_timer.setInterval(_LOG_FLUSH_INTERVAL_MS)
+        self._log_flush_timer.timeout.connect(self._flush_log_buf)
+        # Run log files are written by a background thread fed through this queue
+        self._log_writer_queue = queue.Queue()
+        self._log_writer = threading.Thread(target=self._log_writer_loop, name="log-writer", daemon=True)
+        self._log_writer.start()
         self.current_theme = "light"  # retained for settings compatibility
+        # (guides_dir, class_level, toc_cache mtime) last shown by each lesson loader
+        self._last_loaded_lessons_key = None
+        self._last_loaded_eval_key = None
+        # (guides_dir, class_level) -> (toc_cache mtime, lesson titles) for the evaluation tab
+        self._eval_cache = {}
+        # Shared help dialog and its per-page documents, built on first use
+        self._help_dialog = None
+        self._help_docs = {}
+        # PDF/DOCX export running off the GUI thread, if any
+        self._export_worker = None
+        # Source preview dialog, built on the first preview request and reused afterwards
+        self._source_preview_dialog = None
+        self._src_preview_prompt = ""
+        self._prompt_text_shown = None
+        # Lay the help pages out in the background once the window is up
+        QtCore.QTimer.singleShot(1000, self._prewarm_help)
 
         # Central layout with splitter
         central = QtWidgets.QWidget()
@@ -105,11 +299,22 @@ class MainWindow(QtWidgets.QMainWindow):
         # Editor: raw markdown
         self.preview_editor = QtWidgets.QPlainTextEdit()
         self.preview_editor.setPlaceholderText("Edit the Markdown here...")
+        # Fiches are edited whole, so the editor and preview keep every block
+        self.preview_editor.setMaximumBlockCount(0)
         self.preview_editor.textChanged.connect(self.on_editor_text_changed)
+        # Re-render the preview 200 ms after the last keystroke rather than on each one
+        self._md_debounce = QtCore.QTimer(self)
+        self._md_debounce.setSingleShot(True)
+        self._md_debounce.setInterval(200)
+        self._md_debounce.timeout.connect(self._rerender_markdown)
+        self._md_last_hash = None
+        # Set when the editor changes while the rendered preview is hidden
+        self._md_dirty = False
         # Preview: rendered markdown
         self.preview_edit = QtWidgets.QTextEdit()
         self.preview_edit.setReadOnly(True)
         self.preview_edit.setPlaceholderText("Your generated fiche will appear here.")
+        self.preview_edit.document().setMaximumBlockCount(0)
         self.preview_stack.addWidget(self.preview_edit)   # index 0 = view
         self.preview_stack.addWidget(self.preview_editor) # index 1 = editor
         pv_lay.addWidget(self.preview_stack, 1)
@@ -120,7 +325,7 @@ class MainWindow(QtWidgets.QMainWindow):
         log_layout.setContentsMargins(16, 12, 16, 16)
         self.log_edit = QtWidgets.QPlainTextEdit()
         self.log_edit.setReadOnly(True)
-        self.log_edit.setMaximumBlockCount(5000)
+        self.log_edit.setMaximumBlockCount(_LOG_MAX_BLOCKS)
         log_layout.addWidget(self.log_edit)
 
         # Add tabs
@@ -137,6 +342,18 @@ class MainWindow(QtWidgets.QMainWindow):
         self._load_settings()
         self._apply_style(self.current_theme)
 
+        # Coalesce bursts of sidebar edits into one settings save, 500 ms after the last change;
+        # connected after _load_settings so restoring the controls does not schedule a save
+        self._save_timer = QtCore.QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(500)
+        self._save_timer.timeout.connect(self._save_settings)
+        self.topic_edit.textChanged.connect(self._schedule_save)
+        self.pages_edit.textChanged.connect(self._schedule_save)
+        self.subject_combo.currentTextChanged.connect(self._schedule_save)
+        self.class_combo.currentTextChanged.connect(self._schedule_save)
+        self.duration_spin.valueChanged.connect(self._schedule_save)
+
         # Install native menubar (mac-friendly)
         self._install_menubar()
         # Removed redundant toolbar to keep UI clean and focused
@@ -165,12 +382,48 @@ class MainWindow(QtWidgets.QMainWindow):
         self.resize(1200, 800)
 
         # Start background model update check
-        current_pro = self.settings.value("custom_pro_model", DEFAULT_PRO_MODEL)
-        current_flash = self.settings.value("custom_flash_model", DEFAULT_FLASH_MODEL)
+        current_pro = self._settings_cache["custom_pro_model"]
+        current_flash = self._settings_cache["custom_flash_model"]
         self.model_updater = ModelUpdateWorker(current_pro, current_flash)
         self.model_updater.models_found.connect(self.on_models_updated)
         self.model_updater.start()
 
+    def _wait_for_settings_writes(self, timeout=2.0):
+        """Block until the settings writer has applied every write queued so far (or timeout)."""
+        if not self._settings_writer.is_alive():
+            return
+        done = threading.Event()
+        self._settings_writer_queue.put(done)
+        done.wait(timeout)
+
+    def _reload_settings_cache(self):
+        """Snapshot every key in _SETTINGS_DEFAULTS from QSettings in a single pass."""
+        self._wait_for_settings_writes()
+        settings = self.settings
+        self._settings_cache = {key: settings.value(key, default) for key, default in _SETTINGS_DEFAULTS.items()}
+
+    def _get_setting(self, key, default=None):
+        """Read a setting from _settings_cache, falling back to QSettings for uncached keys."""
+        if key in self._settings_cache:
+            value = self._settings_cache[key]
+            return default if value is None else value
+        self._wait_for_settings_writes()
+        return self.settings.value(key, default)
+
+    def _set_setting(self, key, value):
+        """Queue a settings write, keeping _settings_cache in step; cached keys that already hold value are not rewritten."""
+        cache = self._settings_cache
+        if key in cache:
+            if cache[key] == value:
+                return
+            cache[key] = value
+        self._settings_writer_queue.put((key, value))
+
+    def _get_path_setting(self, key, default):
+        """Cached folder setting, stripped, falling back to default when unset or blank."""
+        value = self._settings_cache.get(key) or default
+        return value.strip() if isinstance(value, str) else default
+
     def on_models_updated(self, old_pro, new_pro, old_flash, new_flash):
         """Called when ModelUpdateWorker finds newer models via Gemma analysis."""
         try:
@@ -198,9 +451,9 @@ class MainWindow(QtWidgets.QMainWindow):
             if reply == QtWidgets.QMessageBox.StandardButton.Yes:
                 # Apply the updates
                 if new_pro:
-                    self.settings.setValue("custom_pro_model", new_pro)
+                    self._set_setting("custom_pro_model", new_pro)
                 if new_flash:
-                    self.settings.setValue("custom_flash_model", new_flash)
+                    self._set_setting("custom_flash_model", new_flash)
                 
                 self.statusBar().showMessage("✨ Models updated!", 5000)
             else:
@@ -232,7 +485,7 @@ class MainWindow(QtWidgets.QMainWindow):
             pass
         # Sidebar spacing preference
         try:
-            compact = self.settings.value("ui_compact_sidebar", "false") == "true"
+            compact = self._settings_cache["ui_compact_sidebar"] == "true"
             if getattr(self, "_left_sidebar_layout", None):
                 self._left_sidebar_layout.setSpacing(8 if compact else 16)
         except Exception:
@@ -280,6 +533,7 @@ class MainWindow(QtWidgets.QMainWindow):
         return tab
 
     def _build_evaluation_tab(self):
+        s = self._settings_cache
         tab = QtWidgets.QWidget()
         layout = QtWidgets.QVBoxLayout(tab)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -299,10 +553,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.eval_subject_combo = QtWidgets.QComboBox()
         self.eval_subject_combo.setEditable(True)
-        self.eval_subject_combo.addItems([
-            "", "Mathématiques", "Sciences", "Français", "Histoire",
-            "Géographie", "Éducation civique", "Arabe", "Anglais", "Islamique"
-        ])
+        self.eval_subject_combo.addItems(SUBJECTS)
         if hasattr(self, 'subject_combo') and isinstance(self.subject_combo, QtWidgets.QComboBox):
             self.eval_subject_combo.setCurrentText(self.subject_combo.currentText())
         config_form.addRow("Subject:", self.eval_subject_combo)
@@ -341,13 +592,13 @@ class MainWindow(QtWidgets.QMainWindow):
 
         # School name
         self.eval_school_name_edit = QtWidgets.QLineEdit()
-        self.eval_school_name_edit.setText(self.settings.value("eval_school_name", "Groupe Scolaire"))
+        self.eval_school_name_edit.setText(s["eval_school_name"])
         self.eval_school_name_edit.setPlaceholderText("e.g., Groupe Scolaire Jabrane")
         settings_form.addRow("School Name:", self.eval_school_name_edit)
 
         # Academic year
         self.eval_academic_year_edit = QtWidgets.QLineEdit()
-        self.eval_academic_year_edit.setText(self.settings.value("eval_academic_year", "2025/2026"))
+        self.eval_academic_year_edit.setText(s["eval_academic_year"])
         self.eval_academic_year_edit.setPlaceholderText("e.g., 2025/2026")
         settings_form.addRow("Academic Year:", self.eval_academic_year_edit)
 
@@ -359,14 +610,14 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.eval_number_spin = QtWidgets.QSpinBox()
         self.eval_number_spin.setRange(1, 10)
-        self.eval_number_spin.setValue(int(self.settings.value("eval_number", "1")))
+        self.eval_number_spin.setValue(int(s["eval_number"]))
         self.eval_number_spin.setPrefix("N° ")
         eval_session_layout.addWidget(self.eval_number_spin)
 
         eval_session_layout.addWidget(QtWidgets.QLabel("Semester:"))
         self.eval_semester_combo = QtWidgets.QComboBox()
         self.eval_semester_combo.addItems(["1", "2"])
-        self.eval_semester_combo.setCurrentText(self.settings.value("eval_semester", "1"))
+        self.eval_semester_combo.setCurrentText(s["eval_semester"])
         eval_session_layout.addWidget(self.eval_semester_combo)
         eval_session_layout.addStretch()
 
@@ -380,8 +631,9 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.eval_max_score_10 = QtWidgets.QRadioButton("/ 10 points")
         self.eval_max_score_20 = QtWidgets.QRadioButton("/ 20 points")
-        self.eval_max_score_10.setChecked(self.settings.value("eval_max_score", "10") == "10")
-        self.eval_max_score_20.setChecked(self.settings.value("eval_max_score", "10") == "20")
+        max_score = s["eval_max_score"]
+        self.eval_max_score_10.setChecked(max_score == "10")
+        self.eval_max_score_20.setChecked(max_score == "20")
         max_score_layout.addWidget(self.eval_max_score_10)
         max_score_layout.addWidget(self.eval_max_score_20)
         max_score_layout.addStretch()
@@ -415,7 +667,7 @@ class MainWindow(QtWidgets.QMainWindow):
         temp_layout.setContentsMargins(0, 0, 0, 0)
         self.eval_temperature_slider = QtWidgets.QSlider(QtCore.Qt.Orientation.Horizontal)
         self.eval_temperature_slider.setRange(0, 100)
-        self.eval_temperature_slider.setValue(int(float(self.settings.value("temperature", "0.5")) * 100))
+        self.eval_temperature_slider.setValue(int(float(s["temperature"]) * 100))
         self.eval_temperature_label = QtWidgets.QLabel(f"{self.eval_temperature_slider.value()/100:.2f}")
         self.eval_temperature_slider.valueChanged.connect(lambda v: self.eval_temperature_label.setText(f"{v/100:.2f}"))
         temp_layout.addWidget(self.eval_temperature_slider, 1)
@@ -447,9 +699,9 @@ class MainWindow(QtWidgets.QMainWindow):
         # Image generation option (if available)
         if HAS_IMAGE_GENERATION:
             self.eval_generate_images_chk = QtWidgets.QCheckBox("Include illustrations/coloring pages (CP/CE1: coloring, others: diagrams)")
-            self.eval_generate_images_chk.setChecked(self.settings.value("generate_eval_images", "false") == "true")
+            self.eval_generate_images_chk.setChecked(s["generate_eval_images"] == "true")
             self.eval_generate_images_chk.setToolTip("Generate simple educational illustrations or coloring pages (hand-drawn style, non-AI look)")
-            self.eval_generate_images_chk.toggled.connect(lambda checked: self.settings.setValue("generate_eval_images", "true" if checked else "false"))
+            self.eval_generate_images_chk.toggled.connect(lambda checked: self._set_setting("generate_eval_images", "true" if checked else "false"))
             formatting_layout.addWidget(self.eval_generate_images_chk)
             
             # Number of images selector
@@ -457,10 +709,10 @@ class MainWindow(QtWidgets.QMainWindow):
             images_count_layout.addWidget(QtWidgets.QLabel("  Number of images:"))
             self.eval_images_count_spin = QtWidgets.QSpinBox()
             self.eval_images_count_spin.setRange(1, 5)
-            self.eval_images_count_spin.setValue(int(self.settings.value("eval_images_count", "2")))
+            self.eval_images_count_spin.setValue(int(s["eval_images_count"]))
             self.eval_images_count_spin.setEnabled(self.eval_generate_images_chk.isChecked())
             self.eval_generate_images_chk.toggled.connect(self.eval_images_count_spin.setEnabled)
-            self.eval_images_count_spin.valueChanged.connect(lambda v: self.settings.setValue("eval_images_count", str(v)))
+            self.eval_images_count_spin.valueChanged.connect(lambda v: self._set_setting("eval_images_count", str(v)))
             images_count_layout.addWidget(self.eval_images_count_spin)
             images_count_layout.addStretch()
             formatting_layout.addLayout(images_count_layout)
@@ -505,10 +757,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.quiz_subject_combo = QtWidgets.QComboBox()
         self.quiz_subject_combo.setEditable(True)
-        self.quiz_subject_combo.addItems([
-            "", "Mathématiques", "Sciences", "Français", "Histoire",
-            "Géographie", "Éducation civique", "Arabe", "Anglais", "Islamique"
-        ])
+        self.quiz_subject_combo.addItems(SUBJECTS)
         config_form.addRow("Subject:", self.quiz_subject_combo)
         layout.addWidget(config_group)
 
@@ -616,13 +865,10 @@ class MainWindow(QtWidgets.QMainWindow):
         try:
             self.quiz_lessons_list.clear()
             class_level = self.quiz_class_combo.currentText()
-            guides_dir = self.settings.value("input_dir", DEFAULT_INPUT_DIR)
+            guides_dir = self._get_path_setting("input_dir", DEFAULT_INPUT_DIR)
             
-            # Create a dummy queue for the find function
-            class DummyQueue:
-                def put(self, msg): pass
-            
-            guide_path = find_guide_file(class_level, guides_dir, DummyQueue())
+            # The find function's log messages are not shown here
+            guide_path = find_guide_file(class_level, guides_dir, _LogQueue())
             if guide_path:
                 cached_toc = get_cached_toc(guide_path, guides_dir)
                 if cached_toc:
@@ -679,7 +925,7 @@ class MainWindow(QtWidgets.QMainWindow):
         duration = self.quiz_duration_spin.value()
         include_answers = self.quiz_include_answers_chk.isChecked()
         extra_instructions = self.quiz_extra_instructions_edit.toPlainText().strip()
-        temperature = self.settings.value("temperature", "0.5")
+        temperature = self._settings_cache["temperature"]
 
         # Determine number of questions from quiz type
         if "5 questions" in quiz_type:
@@ -694,13 +940,13 @@ class MainWindow(QtWidgets.QMainWindow):
             num_questions = 10
 
         # Clear previous content
+        self._log_buf.clear()
         self.log_edit.clear()
         self.preview_editor.clear()
         self.preview_edit.clear()
+        self._md_last_hash = None
         self.current_content = ""
-        self.save_pdf_btn.setEnabled(False)
-        self.save_docx_btn.setEnabled(False)
-        self._set_rating_enabled(False)
+        self._update_save_states(False)
         self.cancel_btn.setEnabled(True)
 
         # Create and start worker
@@ -716,8 +962,8 @@ class MainWindow(QtWidgets.QMainWindow):
             include_answers=include_answers,
             extra_instructions=extra_instructions,
             temperature=float(temperature),
-            guides_dir=self.settings.value("input_dir", DEFAULT_INPUT_DIR),
-            textbook_dir=self.settings.value("textbook_dir", ""),
+            guides_dir=self._settings_cache["input_dir"],
+            textbook_dir=self._settings_cache["textbook_dir"],
             use_student_textbook=self.use_student_textbook_chk.isChecked()
         )
         
@@ -726,6 +972,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self.worker.content.connect(self.on_content_ready)
         self.worker.done.connect(self.on_done)
         self.worker.enable_buttons.connect(self.on_enable_buttons)
+        self.worker.finished.connect(self._on_worker_finished)
+        # Workers read some settings straight from QSettings
+        self._wait_for_settings_writes()
         self.worker.start()
 
         self.append_log(f"🎯 Starting quiz generation for: {topic}")
@@ -765,15 +1014,12 @@ class MainWindow(QtWidgets.QMainWindow):
         
         layout.addRow("Topic:", topic_widget)
         
-        # Load available lessons on startup
-        self._load_available_lessons()
+        # Load available lessons once the window has painted (disk I/O + JSON parse)
+        QtCore.QTimer.singleShot(0, self._load_available_lessons)
 
         # Subject (simplified)
         self.subject_combo = QtWidgets.QComboBox()
-        self.subject_combo.addItems([
-            "", "Mathématiques", "Sciences", "Français", "Histoire", 
-            "Géographie", "Éducation civique", "Arabe", "Anglais", "Islamique"
-        ])
+        self.subject_combo.addItems(SUBJECTS)
         layout.addRow("Subject:", self.subject_combo)
 
         # Action button
@@ -785,6 +1031,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _build_quick_settings(self):
         """Quick access to common settings"""
+        s = self._settings_cache
         group = QtWidgets.QGroupBox("Quick Settings")
         layout = QtWidgets.QFormLayout(group)
         layout.setFieldGrowthPolicy(QtWidgets.QFormLayout.FieldGrowthPolicy.ExpandingFieldsGrow)
@@ -796,7 +1043,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.duration_spin.setRange(15, 180)
         self.duration_spin.setSingleStep(5)
         try:
-            default_duration = int(self.settings.value("default_duration", "45"))
+            default_duration = int(s["default_duration"])
         except Exception:
             default_duration = 45
         self.duration_spin.setValue(default_duration)
@@ -810,7 +1057,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         # Preview source text toggle
         self.quick_preview_source_chk = QtWidgets.QCheckBox("Preview source text")
-        self.quick_preview_source_chk.setChecked(self.settings.value("preview_source", "false") == "true")
+        self.quick_preview_source_chk.setChecked(s["preview_source"] == "true")
         self.quick_preview_source_chk.setToolTip("Show extracted PDF text for confirmation before generating")
         self.quick_preview_source_chk.toggled.connect(self._on_quick_preview_changed)
         layout.addRow("", self.quick_preview_source_chk)
@@ -818,9 +1065,9 @@ class MainWindow(QtWidgets.QMainWindow):
         # Image generation toggle (if available)
         if HAS_IMAGE_GENERATION:
             self.generate_fiche_image_chk = QtWidgets.QCheckBox("Include illustration")
-            self.generate_fiche_image_chk.setChecked(self.settings.value("generate_fiche_images", "false") == "true")
+            self.generate_fiche_image_chk.setChecked(s["generate_fiche_images"] == "true")
             self.generate_fiche_image_chk.setToolTip("Generate a simple educational illustration (hand-drawn style, non-AI look)")
-            self.generate_fiche_image_chk.toggled.connect(lambda checked: self.settings.setValue("generate_fiche_images", "true" if checked else "false"))
+            self.generate_fiche_image_chk.toggled.connect(lambda checked: self._set_setting("generate_fiche_images", "true" if checked else "false"))
             layout.addRow("", self.generate_fiche_image_chk)
 
         return group
@@ -853,6 +1100,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _build_sidebar_footer(self):
         """Rating and save controls"""
+        s = self._settings_cache
         group = QtWidgets.QGroupBox("Output")
         layout = QtWidgets.QVBoxLayout(group)
         layout.setSpacing(8)
@@ -875,13 +1123,13 @@ class MainWindow(QtWidgets.QMainWindow):
         self.model_toggle_flash = QtWidgets.QRadioButton("Flash")
         
         # Set tooltips with actual model names
-        pro_model = get_configured_pro_model()
-        flash_model = get_configured_flash_model()
+        pro_model = s["custom_pro_model"]
+        flash_model = s["custom_flash_model"]
         self.model_toggle.setToolTip(f"Use Pro model: {pro_model}\n(Higher quality, slower)")
         self.model_toggle_flash.setToolTip(f"Use Flash model: {flash_model}\n(Faster, good for drafts)")
         
         # Set default to Pro
-        use_pro = self.settings.value("gemini_use_pro", "true") == "true"
+        use_pro = s["gemini_use_pro"] == "true"
         self.model_toggle.setChecked(use_pro)
         self.model_toggle_flash.setChecked(not use_pro)
         
@@ -894,7 +1142,7 @@ class MainWindow(QtWidgets.QMainWindow):
         model_group_layout.addWidget(self.model_toggle_flash)
         
         # Fallback indicator
-        enable_fallback = self.settings.value("enable_model_fallback", "true") == "true"
+        enable_fallback = s["enable_model_fallback"] == "true"
         if enable_fallback:
             fallback_label = QtWidgets.QLabel("🔄")
             fallback_label.setToolTip("Auto-fallback enabled: if Pro fails, Flash will be used")
@@ -911,7 +1159,7 @@ class MainWindow(QtWidgets.QMainWindow):
         
         self.pdf_template_combo = QtWidgets.QComboBox()
         self.pdf_template_combo.addItems(list(PDF_TEMPLATES.keys()))
-        self.pdf_template_combo.setCurrentText(self.settings.value("default_pdf_style", list(PDF_TEMPLATES.keys())[0]))
+        self.pdf_template_combo.setCurrentText(s["default_pdf_style"])
         self.pdf_template_combo.setToolTip("Choose the visual style for PDF export")
         
         pdf_group_layout.addWidget(self.pdf_template_combo, 1)
@@ -919,7 +1167,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         # Student textbook toggle
         self.use_student_textbook_chk = QtWidgets.QCheckBox("📚 Include student textbook context")
-        self.use_student_textbook_chk.setChecked(self.settings.value("use_student_textbook", "false") == "true")
+        self.use_student_textbook_chk.setChecked(s["use_student_textbook"] == "true")
         self.use_student_textbook_chk.setToolTip("Extract content from student textbooks in addition to teacher guides\n(Useful for evaluations with exercises)")
         self.use_student_textbook_chk.toggled.connect(self._on_student_textbook_toggle)
         layout.addWidget(self.use_student_textbook_chk)
@@ -967,9 +1215,6 @@ class MainWindow(QtWidgets.QMainWindow):
         """Install a complete macOS-style menubar with all standard menus."""
         mb = self.menuBar()
         
-        # Use the correct QAction class for PyQt6
-        from PyQt6.QtGui import QAction
-        
         # Get MenuRole for macOS menu handling
         try:
             MenuRole = QAction.MenuRole
@@ -1126,6 +1371,8 @@ class MainWindow(QtWidgets.QMainWindow):
             except Exception:
                 pass
         act_quit.triggered.connect(self.close)
+        file_menu.addAction(act_quit)
+
         # Window menu (macOS standard)
         window_menu = mb.addMenu("&Window")
         
@@ -1155,18 +1402,14 @@ class MainWindow(QtWidgets.QMainWindow):
         
         # About action
         act_about = QAction("&About FicheGen", self)
-        if PYQT6:
+        if MenuRole is not None:
             try:
-                from PyQt6.QtGui import QAction
-                MenuRole = QAction.MenuRole
                 act_about.setMenuRole(MenuRole.AboutRole)
             except Exception:
                 pass
         act_about.triggered.connect(self._show_about)
         help_menu.addAction(act_about)
-        # Remove extra English Help menu to avoid duplication with Aide
-        help_menu.addAction(act_about)
-        # Remove extra English Help menu to avoid duplication with Aide
+
     def _install_toolbar(self):
         # Toolbar removed as per design: redundant with main controls
         return
@@ -1179,7 +1422,8 @@ class MainWindow(QtWidgets.QMainWindow):
             dialog = PreferencesDialog(self)
             print("DEBUG: PreferencesDialog created successfully")
             
-            # Load current settings into the dialog
+            # Load current settings into the dialog, once queued writes have landed
+            self._wait_for_settings_writes()
             dialog.load_from_settings(self.settings)
             print("DEBUG: Settings loaded into dialog")
             
@@ -1196,7 +1440,7 @@ class MainWindow(QtWidgets.QMainWindow):
             if accepted:
                 print("DEBUG: User accepted dialog, saving settings")
                 # Save the settings from the dialog
-                dialog.save_to_settings(self.settings)
+                dialog.save_to_settings(_QueuedSettings(self))
                 # Sync the main window with the new settings
                 self._sync_from_preferences()
                 print("DEBUG: Settings saved and synced successfully")
@@ -1205,7 +1449,6 @@ class MainWindow(QtWidgets.QMainWindow):
                 
         except Exception as e:
             print(f"ERROR in _show_preferences: {e}")
-            import traceback
             traceback.print_exc()
             # Show a simple message box instead of crashing
             QtWidgets.QMessageBox.warning(
@@ -1216,12 +1459,15 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _sync_from_preferences(self):
         """Sync main window controls from preferences"""
-        # Reload API keys from settings
+        # Reload API keys from settings, once the dialog's writes have landed
+        self._wait_for_settings_writes()
         load_api_keys_from_settings()
+        # Preferences may have rewritten any cached key
+        self._reload_settings_cache()
         # Update any controls that might be affected by preferences
         # Apply compact sidebar spacing immediately
         try:
-            compact = self.settings.value("ui_compact_sidebar", "false") == "true"
+            compact = self._settings_cache["ui_compact_sidebar"] == "true"
             if getattr(self, "_left_sidebar_layout", None):
                 self._left_sidebar_layout.setSpacing(8 if compact else 16)
         except Exception:
@@ -1230,10 +1476,26 @@ class MainWindow(QtWidgets.QMainWindow):
         # Refresh available lessons in case input directory changed
         self._load_available_lessons()
 
+    @staticmethod
+    def _toc_cache_mtime(path):
+        """Return the mtime of a toc_cache file, or None if it can't be stat'ed."""
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
     def _load_available_lessons(self):
         """Load available lessons from toc_cache in the input directory for the selected class."""
         try:
-            guides_dir = self.settings.value("input_dir", DEFAULT_INPUT_DIR)
+            guides_dir = self._get_path_setting("input_dir", DEFAULT_INPUT_DIR)
+            current_class = self.class_combo.currentText().lower()
+            json_path = os.path.join(guides_dir or "", "toc_cache", f"guide_pedagogique_{current_class}.pdf.json")
+            load_key = (guides_dir, current_class, self._toc_cache_mtime(json_path))
+            if load_key == self._last_loaded_lessons_key:
+                # Same class, same folder, cache untouched: the combo is already up to date
+                return
+            self._last_loaded_lessons_key = load_key
+
             if not guides_dir or not os.path.isdir(guides_dir):
                 self.lesson_selector_combo.setVisible(False)
                 return
@@ -1243,13 +1505,6 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.lesson_selector_combo.setVisible(False)
                 return
             
-            # Get current class level
-            current_class = self.class_combo.currentText().lower()
-            
-            # Look for JSON file matching the class level
-            target_json = f"guide_pedagogique_{current_class}.pdf.json"
-            json_path = os.path.join(toc_cache_dir, target_json)
-            
             if not os.path.exists(json_path):
                 # No JSON for this class level - hide dropdown
                 self.lesson_selector_combo.setVisible(False)
@@ -1331,46 +1586,83 @@ class MainWindow(QtWidgets.QMainWindow):
         if not hasattr(self, 'eval_lessons_list'):
             return
 
+        guides_dir = self._get_path_setting("input_dir", DEFAULT_INPUT_DIR)
+        class_level = self.eval_class_combo.currentText().lower()
+        toc_cache_dir = os.path.join(guides_dir or "", "toc_cache")
+        # A single stat of toc_cache gates everything: adding/replacing a cached ToC bumps its mtime
+        cache_mtime = self._toc_cache_mtime(toc_cache_dir)
+        load_key = (guides_dir, class_level, cache_mtime)
+        if load_key == self._last_loaded_eval_key:
+            return
+        self._last_loaded_eval_key = load_key
+
         self.eval_lessons_list.clear()
-        guides_dir = self.settings.value("input_dir", DEFAULT_INPUT_DIR)
         if not guides_dir or not os.path.isdir(guides_dir):
             self.eval_lessons_list.addItem("No guides directory configured")
             self.eval_lessons_list.item(0).setFlags(QtCore.Qt.ItemFlag.NoItemFlags)
             return
 
-        toc_cache_dir = os.path.join(guides_dir, "toc_cache")
-        if not os.path.isdir(toc_cache_dir):
+        if cache_mtime is None:
             self.eval_lessons_list.addItem("Generate fiches at least once to build ToC cache")
             self.eval_lessons_list.item(0).setFlags(QtCore.Qt.ItemFlag.NoItemFlags)
             return
 
-        class_level = self.eval_class_combo.currentText().lower()
+        cached = self._eval_cache.get((guides_dir, class_level))
+        if cached and cached[0] == cache_mtime:
+            titles = cached[1]
+        else:
+            titles = self._read_eval_titles(toc_cache_dir, class_level)
+            self._eval_cache[(guides_dir, class_level)] = (cache_mtime, titles)
+
+        if not titles:
+            self.eval_lessons_list.addItem("No cached ToC for this class yet")
+            self.eval_lessons_list.item(0).setFlags(QtCore.Qt.ItemFlag.NoItemFlags)
+            return
+
+        self.eval_lessons_list.addItems(titles)
+
+    @staticmethod
+    def _read_eval_titles(toc_cache_dir, class_level):
+        """Return the lesson titles of the cached ToC for a class, scanning toc_cache once."""
         candidates = [f"guide_pedagogique_{class_level}.pdf.json"]
         if class_level == "6e":
             candidates.append("guide_pedagogique_6eme.pdf.json")
 
-        toc_data = None
+        try:
+            with os.scandir(toc_cache_dir) as entries:
+                present = {entry.name: entry.path for entry in entries if entry.name in candidates and entry.is_file()}
+        except OSError:
+            return []
+
         for candidate in candidates:
-            json_path = os.path.join(toc_cache_dir, candidate)
-            if os.path.exists(json_path):
-                try:
-                    with open(json_path, "r", encoding="utf-8") as f:
-                        toc_data = json.load(f)
-                        if isinstance(toc_data, list):
-                            break
-                except (json.JSONDecodeError, IOError):
-                    toc_data = None
-
-        if not toc_data:
-            self.eval_lessons_list.addItem("No cached ToC for this class yet")
-            self.eval_lessons_list.item(0).setFlags(QtCore.Qt.ItemFlag.NoItemFlags)
+            json_path = present.get(candidate)
+            if not json_path:
+                continue
+            try:
+                with open(json_path, "r", encoding="utf-8") as f:
+                    toc_data = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                continue
+            if isinstance(toc_data, list):
+                titles = []
+                for entry in toc_data:
+                    if isinstance(entry, dict):
+                        title = (entry.get("topic") or "").strip()
+                        if title:
+                            titles.append(title)
+                return titles
+        return []
+
+    def _update_save_states(self, can_save: bool):
+        """Enable or disable the save buttons and rating controls together"""
+        if can_save == self._save_state:
             return
-
-        for entry in toc_data:
-            if isinstance(entry, dict):
-                title = (entry.get("topic") or "").strip()
-                if title:
-                    self.eval_lessons_list.addItem(title)
+        self._save_state = can_save
+        # The save buttons stay off while an export runs; _on_export_finished restores them
+        if not self._export_running():
+            self.save_pdf_btn.setEnabled(can_save)
+            self.save_docx_btn.setEnabled(can_save and self._docx_enabled)
+        self._set_rating_enabled(can_save)
 
     def _set_rating_enabled(self, enabled: bool):
         self.rating_label.setEnabled(enabled)
@@ -1382,747 +1674,213 @@ class MainWindow(QtWidgets.QMainWindow):
         pass
 
     # Help system methods
-    def _show_help_dialog(self, title: str, content: str):
-        """Show a help dialog with formatted content"""
+    def _build_help_dialog(self):
+        """Build the help dialog once; pages are swapped in by _show_help_dialog."""
         dialog = QtWidgets.QDialog(self)
-        dialog.setWindowTitle(title)
         dialog.setModal(True)
-        dialog.resize(800, 600)
+        # Room for the fixed-width page plus frame margins and the scrollbar
+        dialog.resize(_HELP_TEXT_WIDTH + 60, 600)
         
         layout = QtWidgets.QVBoxLayout(dialog)
         
-        # Scrollable text area
-        scroll = QtWidgets.QScrollArea()
-        text_widget = QtWidgets.QTextEdit()
-        text_widget.setHtml(content)
-        text_widget.setReadOnly(True)
-        scroll.setWidget(text_widget)
-        scroll.setWidgetResizable(True)
-        layout.addWidget(scroll)
+        # QTextBrowser scrolls on its own; links are routed through _on_help_link
+        self._help_browser = QtWidgets.QTextBrowser()
+        self._help_browser.setOpenLinks(False)
+        self._help_browser.anchorClicked.connect(self._on_help_link)
+        # Wrap at the width the documents were laid out at, so setDocument does not re-flow them
+        self._help_browser.setLineWrapMode(QtWidgets.QTextEdit.LineWrapMode.FixedPixelWidth)
+        self._help_browser.setLineWrapColumnOrWidth(_HELP_TEXT_WIDTH)
+        layout.addWidget(self._help_browser)
         
         # Close button
         button_box = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.StandardButton.Ok)
         button_box.accepted.connect(dialog.accept)
         layout.addWidget(button_box)
         
-        dialog.exec()
+        return dialog
+
+    def _help_doc(self, name: str):
+        """Return the laid-out QTextDocument for a help section, building it once"""
+        doc = self._help_docs.get(name)
+        if doc is None:
+            doc = QtGui.QTextDocument(self)
+            doc.setDefaultStyleSheet(_load_help("help.css"))
+            doc.setHtml(_load_help(HELP_SECTIONS[name][1]))
+            doc.setTextWidth(_HELP_TEXT_WIDTH)
+            doc.documentLayout().documentSize()
+            self._help_docs[name] = doc
+        return doc
+
+    def _prewarm_help(self, pending=None):
+        """Build the help documents one per event-loop turn so the first open is instant"""
+        if pending is None:
+            pending = [name for name in HELP_SECTIONS if name not in self._help_docs]
+        if not pending:
+            return
+        name = pending.pop(0)
+        try:
+            self._help_doc(name)
+        except Exception as e:
+            # Leave this page to be built on open and carry on with the rest
+            self.append_log(f"⚠️ Could not prepare help page '{name}': {e}")
+        if pending:
+            QtCore.QTimer.singleShot(0, lambda: self._prewarm_help(pending))
+
+    def _show_help_dialog(self, title: str, doc):
+        """Show the shared help dialog with the given document"""
+        if self._help_dialog is None:
+            self._help_dialog = self._build_help_dialog()
+        self._help_browser.setDocument(doc)
+        
+        self._help_dialog.setWindowTitle(title)
+        self._help_dialog.show()
+        self._help_dialog.raise_()
+        self._help_dialog.activateWindow()
+
+    def _on_help_link(self, url):
+        """Open links between help pages in the same dialog, others in the browser"""
+        if url.isRelative():
+            for name, (_, filename) in HELP_SECTIONS.items():
+                if filename == url.fileName():
+                    self._open_help(name)
+                    return
+        QtGui.QDesktopServices.openUrl(url)
+
+    def _open_help(self, name: str):
+        """Open the help section registered under name in HELP_SECTIONS"""
+        self._show_help_dialog(HELP_SECTIONS[name][0], self._help_doc(name))
 
     def _show_user_guide(self):
         """Show comprehensive user guide"""
-        content = """
-        <h1>📚 Guide d'utilisation FicheGen</h1>
-        
-        <h2>🚀 Démarrage rapide</h2>
-        <p><strong>FicheGen</strong> est un assistant intelligent qui génère automatiquement des fiches pédagogiques 
-        à partir des guides pédagogiques du Maroc. Voici comment l'utiliser :</p>
-        
-        <h3>1. Configuration initiale</h3>
-        <ul>
-            <li><strong>Clés API :</strong> Allez dans <em>Préférences > AI & Models</em> et ajoutez vos clés API
-                <ul>
-                    <li>OpenRouter : pour accéder à plusieurs modèles gratuits</li>
-                    <li>Gemini : pour l'accès gratuit aux modèles Google</li>
-                </ul>
-            </li>
-            <li><strong>Dossiers :</strong> Configurez vos dossiers dans <em>Préférences > Folders</em>
-                <ul>
-                    <li>Dossier guides : où se trouvent vos PDFs de guides pédagogiques</li>
-                    <li>Dossier sortie : où seront sauvegardées vos fiches générées</li>
-                </ul>
-            </li>
-        </ul>
-        
-        <h3>2. Génération d'une fiche</h3>
-        <ol>
-            <li><strong>Sélectionnez la classe :</strong> CP, CE1, CE2, CM1, CM2, 6e, etc.</li>
-            <li><strong>Entrez le sujet :</strong> Exemple : "Le cycle de l'eau", "Les fractions"</li>
-            <li><strong>Choisissez la matière :</strong> Sciences, Mathématiques, Français, etc.</li>
-            <li><strong>Définissez la durée :</strong> Par défaut 45 minutes, ajustable</li>
-            <li><strong>Cliquez sur "Générer" :</strong> Ou utilisez Cmd+Entrée</li>
-        </ol>
-        
-        <h3>3. Révision et sauvegarde</h3>
-        <ul>
-            <li><strong>Aperçu :</strong> Visualisez votre fiche dans l'onglet "Preview"</li>
-            <li><strong>Modification :</strong> Cochez "✏️ Edit Markdown" pour modifier directement</li>
-            <li><strong>Évaluation :</strong> Notez la qualité de la fiche (1-5 étoiles)</li>
-            <li><strong>Sauvegarde :</strong> 
-                <ul>
-                    <li>PDF : Cmd+S (plusieurs thèmes disponibles)</li>
-                    <li>DOCX : Shift+Cmd+S (format Word)</li>
-                </ul>
-            </li>
-        </ul>
-        
-        <h2>📝 Structure des fiches générées</h2>
-        <p>Chaque fiche contient :</p>
-        <ul>
-            <li><strong>Informations générales :</strong> Titre, classe, durée, matière</li>
-            <li><strong>Objectifs pédagogiques :</strong> 2-3 objectifs précis</li>
-            <li><strong>Déroulement :</strong> Phases détaillées avec timings</li>
-            <li><strong>Évaluation :</strong> Méthodes d'évaluation proposées</li>
-            <li><strong>Conclusion :</strong> Résumé pour les élèves</li>
-        </ul>
-        
-        <h2>🎯 Conseils pour de meilleurs résultats</h2>
-        <ul>
-            <li><strong>Soyez précis :</strong> "Les triangles isocèles" plutôt que "géométrie"</li>
-            <li><strong>Vérifiez l'orthographe :</strong> L'app corrige automatiquement les erreurs courantes</li>
-            <li><strong>Utilisez les évaluations :</strong> Notez vos fiches pour améliorer les suggestions futures</li>
-            <li><strong>Explorez les thèmes PDF :</strong> Normal, Professionnel, Esthétique, etc.</li>
-        </ul>
-        
-        <h2>⚙️ Raccourcis clavier</h2>
-        <ul>
-            <li><strong>Cmd+Entrée :</strong> Générer une fiche</li>
-            <li><strong>Échap :</strong> Annuler la génération</li>
-            <li><strong>Cmd+S :</strong> Sauvegarder en PDF</li>
-            <li><strong>Shift+Cmd+S :</strong> Sauvegarder en DOCX</li>
-            <li><strong>Cmd+, :</strong> Ouvrir les préférences</li>
-            <li><strong>Cmd+Retour arrière :</strong> Effacer l'aperçu</li>
-        </ul>
-        """
-        self._show_help_dialog("Guide d'utilisation", content)
+        self._open_help("usage")
 
     def _show_advanced_features(self):
         """Show advanced features documentation"""
-        content = """
-        <h1>🔧 Fonctionnalités avancées</h1>
-        
-        <h2>📖 Système de Table des Matières (ToC)</h2>
-        <p>FicheGen analyse automatiquement les guides pédagogiques pour extraire les pages correspondantes à votre sujet.</p>
-        
-        <h3>Cache intelligent</h3>
-        <ul>
-            <li><strong>Première analyse :</strong> L'app utilise l'IA pour analyser la table des matières</li>
-            <li><strong>Mise en cache :</strong> Les résultats sont sauvegardés dans <code>guides/toc_cache/</code></li>
-            <li><strong>Réutilisation :</strong> Les analyses suivantes sont instantanées</li>
-            <li><strong>Détection d'offset :</strong> Correction automatique de la numérotation des pages</li>
-        </ul>
-        
-        <h3>Pages manuelles</h3>
-        <ul>
-            <li><strong>Format simple :</strong> <code>42</code> pour une page unique</li>
-            <li><strong>Format plage :</strong> <code>42-46</code> pour plusieurs pages</li>
-            <li><strong>Format multiple :</strong> <code>42,45,48-50</code> pour des pages non-consécutives</li>
-        </ul>
-        
-        <h2>🎨 Thèmes PDF avancés</h2>
-        
-        <h3>Normal</h3>
-        <ul>
-            <li>Thème élégant et neutre</li>
-            <li>Parfait pour un usage quotidien</li>
-            <li>Couleurs sobres, lisibilité optimale</li>
-        </ul>
-        
-        <h3>Professionnel</h3>
-        <ul>
-            <li>Style corporate avec hiérarchie marquée</li>
-            <li>Marges larges, typographie moderne</li>
-            <li>Idéal pour les présentations officielles</li>
-        </ul>
-        
-        <h3>Esthétique</h3>
-        <ul>
-            <li>Design vibrant et créatif</li>
-            <li>Espacement dramatique</li>
-            <li>Parfait pour captiver l'attention</li>
-        </ul>
-        
-        <h3>Minimal Pro</h3>
-        <ul>
-            <li>Ultra-épuré avec beaucoup d'espace blanc</li>
-            <li>Lignes ultra-fines</li>
-            <li>Style moderne et minimaliste</li>
-        </ul>
-        
-        <h3>Classic Serif</h3>
-        <ul>
-            <li>Thème académique traditionnel</li>
-            <li>Police serif pour un rendu formel</li>
-            <li>Marges académiques standards</li>
-        </ul>
-        
-        <h2>🤖 Système d'IA multi-modèles</h2>
-        
-        <h3>Fallback intelligent</h3>
-        <p>Si votre modèle principal échoue, l'app essaie automatiquement :</p>
-        <ol>
-            <li>Votre modèle sélectionné</li>
-            <li>Les autres modèles OpenRouter disponibles</li>
-            <li>Gemini (si la clé est configurée)</li>
-        </ol>
-        
-        <h3>Modèles spécialisés</h3>
-        <ul>
-            <li><strong>Table des matières :</strong> Gemini 2.5 Flash</li>
-            <li><strong>Correction syntaxe :</strong> Gemma 3-27B</li>
-            <li><strong>Détection offset :</strong> Gemini 2.5 Flash Lite</li>
-            <li><strong>Génération fiches :</strong> Modèle de votre choix</li>
-        </ul>
-        
-        <h2>📊 Système d'évaluation et apprentissage</h2>
-        
-        <h3>Évaluations</h3>
-        <ul>
-            <li><strong>1-2 étoiles :</strong> Fiche de faible qualité</li>
-            <li><strong>3 étoiles :</strong> Fiche correcte</li>
-            <li><strong>4-5 étoiles :</strong> Excellente fiche</li>
-        </ul>
-        
-        <h3>Amélioration continue</h3>
-        <ul>
-            <li>Les fiches bien notées deviennent des exemples de style</li>
-            <li>L'IA apprend de vos préférences</li>
-            <li>Qualité progressivement améliorée</li>
-        </ul>
-        
-        <h2>📄 Formats d'export</h2>
-        
-        <h3>PDF</h3>
-        <ul>
-            <li>Rendu professionnel avec thèmes</li>
-            <li>Métadonnées automatiques</li>
-            <li>Optimisé pour l'impression</li>
-        </ul>
-        
-        <h3>DOCX</h3>
-        <ul>
-            <li>Compatible Microsoft Word</li>
-            <li>Modification facile</li>
-            <li>Partage collaboratif</li>
-        </ul>
-        
-        <h2>⚡ Instructions spéciales</h2>
-        <p>Dans <em>Préférences > Avancé</em>, vous pouvez ajouter des instructions personnalisées :</p>
-        <ul>
-            <li>"Pas d'activités de groupe, privilégier le travail individuel"</li>
-            <li>"Ne pas suggérer de vidéos"</li>
-            <li>"Adapter pour des élèves en difficulté"</li>
-            <li>"Intégrer plus d'exemples concrets"</li>
-        </ul>
-        """
-        self._show_help_dialog("Fonctionnalités avancées", content)
+        self._open_help("advanced")
 
     def _show_api_help(self):
         """Show API configuration help"""
-        content = """
-        <h1>🔑 Configuration des clés API</h1>
-        
-        <h2>📋 Vue d'ensemble</h2>
-        <p>FicheGen utilise des services d'intelligence artificielle pour analyser vos guides pédagogiques et générer des fiches. 
-        Vous avez besoin d'au moins une clé API pour utiliser l'application.</p>
-        
-        <h2>🌟 OpenRouter (Recommandé)</h2>
-        
-        <h3>Avantages</h3>
-        <ul>
-            <li><strong>Modèles gratuits :</strong> Accès à Gemma, DeepSeek, Mistral, Llama</li>
-            <li><strong>Diversité :</strong> Plusieurs modèles pour différents besoins</li>
-            <li><strong>Fiabilité :</strong> Service stable et rapide</li>
-            <li><strong>Pas de limite stricte :</strong> Usage généreux pour les modèles gratuits</li>
-        </ul>
-        
-        <h3>Comment obtenir votre clé</h3>
-        <ol>
-            <li>Allez sur <a href="https://openrouter.ai/">openrouter.ai</a></li>
-            <li>Créez un compte (gratuit)</li>
-            <li>Allez dans <em>Keys</em> dans votre tableau de bord</li>
-            <li>Cliquez sur <em>Create Key</em></li>
-            <li>Copiez la clé et collez-la dans FicheGen</li>
-        </ol>
-        
-        <h3>Modèles gratuits disponibles</h3>
-        <ul>
-            <li><strong>Google Gemma 2 27B :</strong> Excellent pour l'éducation</li>
-            <li><strong>DeepSeek Chat V3.1 :</strong> Très créatif</li>
-            <li><strong>DeepSeek R1 :</strong> Raisonnement avancé</li>
-            <li><strong>Mistral Small :</strong> Rapide et efficace</li>
-            <li><strong>Llama 4 Scout :</strong> Dernière génération Meta</li>
-        </ul>
-        
-        <h2>🧠 Google Gemini</h2>
-        
-        <h3>Avantages</h3>
-        <ul>
-            <li><strong>Gratuit :</strong> Quota généreux sans carte de crédit</li>
-            <li><strong>Rapide :</strong> Réponses très rapides</li>
-            <li><strong>Français natif :</strong> Excellent en français</li>
-            <li><strong>Analyse PDF :</strong> Optimisé pour l'analyse de documents</li>
-        </ul>
-        
-        <h3>Comment obtenir votre clé</h3>
-        <ol>
-            <li>Allez sur <a href="https://ai.google.dev/">ai.google.dev</a></li>
-            <li>Connectez-vous avec votre compte Google</li>
-            <li>Cliquez sur <em>Get API Key</em></li>
-            <li>Créez un nouveau projet ou utilisez un existant</li>
-            <li>Copiez la clé et collez-la dans FicheGen</li>
-        </ol>
-        
-        <h2>⚙️ Configuration dans FicheGen</h2>
-        
-        <h3>Méthode 1 : Préférences (Recommandée)</h3>
-        <ol>
-            <li>Ouvrez <em>Préférences</em> (Cmd+,)</li>
-            <li>Allez dans l'onglet <em>AI & Models</em></li>
-            <li>Collez vos clés dans les champs appropriés</li>
-            <li>Cliquez sur l'œil 👁 pour vérifier</li>
-            <li>Cliquez <em>OK</em> pour sauvegarder</li>
-        </ol>
-        
-        <h3>Méthode 2 : Variables d'environnement</h3>
-        <p>Ajoutez dans votre terminal :</p>
-        <pre>
-export OPENROUTER_API_KEY="votre_clé_ici"
-export GEMINI_API_KEY="votre_clé_ici"
-        </pre>
-        
-        <h3>Méthode 3 : Fichier keys.txt</h3>
-        <p>Créez un fichier <code>keys.txt</code> dans le dossier de l'app :</p>
-        <pre>
-OPENROUTER_API_KEY=votre_clé_ici
-GEMINI_API_KEY=votre_clé_ici
-        </pre>
-        
-        <h2>🔒 Sécurité</h2>
-        <ul>
-            <li><strong>Stockage local :</strong> Vos clés restent sur votre ordinateur</li>
-            <li><strong>Chiffrement système :</strong> Utilise le trousseau macOS</li>
-            <li><strong>Aucun partage :</strong> Vos clés ne sont jamais transmises à FicheGen</li>
-            <li><strong>Révocation :</strong> Vous pouvez révoquer vos clés à tout moment</li>
-        </ul>
-        
-        <h2>💡 Conseils</h2>
-        <ul>
-            <li><strong>Deux clés :</strong> Configurez OpenRouter ET Gemini pour plus de fiabilité</li>
-            <li><strong>Test :</strong> Générée une fiche de test après configuration</li>
-            <li><strong>Quotas :</strong> Surveillez votre usage sur les plateformes</li>
-            <li><strong>Sauvegarde :</strong> Notez vos clés dans un gestionnaire de mots de passe</li>
-        </ul>
-        
-        <h2>❌ Résolution de problèmes</h2>
-        <ul>
-            <li><strong>"Clé manquante" :</strong> Vérifiez que la clé est bien saisie</li>
-            <li><strong>"Quota dépassé" :</strong> Attendez la réinitialisation ou changez de modèle</li>
-            <li><strong>"Erreur réseau" :</strong> Vérifiez votre connexion internet</li>
-            <li><strong>"Modèle indisponible" :</strong> Essayez un autre modèle</li>
-        </ul>
-        """
-        self._show_help_dialog("Configuration API", content)
+        self._open_help("api")
 
     def _show_troubleshooting(self):
         """Show troubleshooting guide"""
-        content = """
-        <h1>🔧 Résolution de problèmes</h1>
-        
-        <h2>🚨 Problèmes fréquents</h2>
-        
-        <h3>❌ "Impossible de trouver le guide pour [classe]"</h3>
-        <p><strong>Cause :</strong> Le fichier PDF n'est pas trouvé dans le dossier guides.</p>
-        <p><strong>Solutions :</strong></p>
-        <ul>
-            <li>Vérifiez que le fichier existe : <code>guide_pedagogique_cm2.pdf</code></li>
-            <li>Respectez la nomenclature : <code>guide_pedagogique_[classe].pdf</code></li>
-            <li>Pour la 6ème : <code>guide_pedagogique_6e.pdf</code> ou <code>guide_pedagogique_6eme.pdf</code></li>
-            <li>Vérifiez le dossier dans <em>Préférences > Folders</em></li>
-        </ul>
-        
-        <h3>🔑 "Clé API manquante ou invalide"</h3>
-        <p><strong>Cause :</strong> Problème de configuration des clés API.</p>
-        <p><strong>Solutions :</strong></p>
-        <ul>
-            <li>Vérifiez vos clés dans <em>Préférences > AI & Models</em></li>
-            <li>Cliquez sur l'œil 👁 pour révéler et vérifier</li>
-            <li>Régénérez une nouvelle clé sur la plateforme</li>
-            <li>Testez avec un autre fournisseur (OpenRouter ↔ Gemini)</li>
-        </ul>
-        
-        <h3>📄 "Erreur d'extraction PDF"</h3>
-        <p><strong>Cause :</strong> Le PDF est corrompu ou protégé.</p>
-        <p><strong>Solutions :</strong></p>
-        <ul>
-            <li>Vérifiez que le PDF s'ouvre normalement</li>
-            <li>Essayez de le ré-enregistrer avec un autre outil</li>
-            <li>Vérifiez qu'il n'est pas protégé par mot de passe</li>
-            <li>Utilisez un PDF plus récent ou de meilleure qualité</li>
-        </ul>
-        
-        <h3>🧠 "Aucune page trouvée pour le sujet"</h3>
-        <p><strong>Cause :</strong> L'IA n'arrive pas à localiser le sujet dans la table des matières.</p>
-        <p><strong>Solutions :</strong></p>
-        <ul>
-            <li>Vérifiez l'orthographe du sujet</li>
-            <li>Utilisez le titre exact du guide</li>
-            <li>Essayez des variantes : "fractions" → "les fractions"</li>
-            <li>Spécifiez les pages manuellement : <code>42-46</code></li>
-        </ul>
-        
-        <h3>⚡ "Génération lente ou qui plante"</h3>
-        <p><strong>Causes possibles :</strong></p>
-        <ul>
-            <li>Connexion internet lente</li>
-            <li>Modèle surchargé</li>
-            <li>PDF très volumineux</li>
-        </ul>
-        <p><strong>Solutions :</strong></p>
-        <ul>
-            <li>Changez de modèle (essayez Gemini)</li>
-            <li>Réduisez la température (plus déterministe)</li>
-            <li>Spécifiez des pages précises plutôt que l'auto-détection</li>
-            <li>Redémarrez l'application</li>
-        </ul>
-        
-        <h2>💾 Problèmes de sauvegarde</h2>
-        
-        <h3>🚫 "Permission refusée"</h3>
-        <p><strong>Cause :</strong> Problème de droits d'écriture.</p>
-        <p><strong>Solutions :</strong></p>
-        <ul>
-            <li>Changez le dossier de sortie vers Documents</li>
-            <li>Vérifiez les permissions du dossier</li>
-            <li>Évitez les dossiers système</li>
-            <li>Créez un nouveau dossier dédié</li>
-        </ul>
-        
-        <h3>📱 "Fichier non créé"</h3>
-        <p><strong>Solutions :</strong></p>
-        <ul>
-            <li>Vérifiez l'espace disque disponible</li>
-            <li>Fermez d'autres applications utilisant le fichier</li>
-            <li>Utilisez un nom de fichier plus simple</li>
-            <li>Essayez un autre format (PDF → DOCX)</li>
-        </ul>
-        
-        <h2>🌐 Problèmes réseau</h2>
-        
-        <h3>🔌 "Erreur de connexion"</h3>
-        <p><strong>Solutions :</strong></p>
-        <ul>
-            <li>Vérifiez votre connexion internet</li>
-            <li>Désactivez temporairement VPN/proxy</li>
-            <li>Vérifiez que les domaines ne sont pas bloqués :
-                <ul>
-                    <li>openrouter.ai</li>
-                    <li>generativelanguage.googleapis.com</li>
-                </ul>
-            </li>
-            <li>Essayez depuis un autre réseau</li>
-        </ul>
-        
-        <h2>⚙️ Problèmes de performance</h2>
-        
-        <h3>🐌 Application lente</h3>
-        <p><strong>Solutions :</strong></p>
-        <ul>
-            <li>Fermez d'autres applications gourmandes</li>
-            <li>Nettoyez le cache : supprimez le dossier <code>toc_cache</code></li>
-            <li>Redémarrez l'application</li>
-            <li>Vérifiez l'espace disque disponible</li>
-        </ul>
-        
-        <h3>💾 Usage mémoire élevé</h3>
-        <p><strong>Solutions :</strong></p>
-        <ul>
-            <li>Évitez d'ouvrir plusieurs gros PDFs simultanément</li>
-            <li>Fermez l'onglet Preview entre les générations</li>
-            <li>Redémarrez l'app périodiquement</li>
-        </ul>
-        
-        <h2>🔄 Réinitialisation</h2>
-        
-        <h3>🗑️ Effacer les préférences</h3>
-        <p>En cas de problème persistant :</p>
-        <ol>
-            <li>Fermez FicheGen</li>
-            <li>Ouvrez Terminal</li>
-            <li>Tapez : <code>defaults delete com.FicheGen.Pedago</code></li>
-            <li>Relancez FicheGen</li>
-        </ol>
-        
-        <h3>🗂️ Nettoyer le cache</h3>
-        <p>Pour forcer une nouvelle analyse des guides :</p>
-        <ul>
-            <li>Supprimez le dossier <code>guides/toc_cache/</code></li>
-            <li>La prochaine génération recréera le cache</li>
-        </ul>
-        
-        <h2>📞 Obtenir de l'aide</h2>
-        <p>Si le problème persiste :</p>
-        <ul>
-            <li>Consultez les logs dans l'onglet "Logs"</li>
-            <li>Notez le message d'erreur exact</li>
-            <li>Essayez avec un guide et un sujet différents</li>
-            <li>Redémarrez l'application</li>
-        </ul>
-        """
-        self._show_help_dialog("Résolution de problèmes", content)
+        self._open_help("troubleshooting")
 
     def _show_tips(self):
         """Show tips and tricks"""
-        content = """
-        <h1>💡 Conseils et astuces</h1>
-        
-        <h2>🎯 Optimiser la qualité des fiches</h2>
-        
-        <h3>📝 Sujets bien formulés</h3>
-        <ul>
-            <li><strong>Spécifique :</strong> "Les triangles isocèles" > "géométrie"</li>
-            <li><strong>Correct :</strong> "Le cycle de l'eau" > "cycle eau"</li>
-            <li><strong>Complet :</strong> "La multiplication des nombres décimaux" > "multiplication"</li>
-            <li><strong>Naturel :</strong> Comme dans le guide pédagogique</li>
-        </ul>
-        
-        <h3>⏱️ Durées réalistes</h3>
-        <ul>
-            <li><strong>CP-CE1 :</strong> 30-40 minutes</li>
-            <li><strong>CE2-CM1 :</strong> 45-50 minutes</li>
-            <li><strong>CM2-6e :</strong> 50-60 minutes</li>
-            <li><strong>Matières pratiques :</strong> +10 minutes (manipulation)</li>
-        </ul>
-        
-        <h3>📚 Matières précises</h3>
-        <ul>
-            <li><strong>Évitez :</strong> "Général", "Divers"</li>
-            <li><strong>Préférez :</strong> "Sciences", "Mathématiques", "Français"</li>
-            <li><strong>Spécialisez :</strong> "Géométrie", "Grammaire", "Histoire"</li>
-        </ul>
-        
-        <h2>⚡ Astuces de productivité</h2>
-        
-        <h3>⌨️ Raccourcis indispensables</h3>
-        <ul>
-            <li><strong>Cmd+Entrée :</strong> Génération rapide</li>
-            <li><strong>Cmd+S :</strong> Sauvegarde PDF instantanée</li>
-            <li><strong>Cmd+, :</strong> Préférences rapides</li>
-            <li><strong>Échap :</strong> Annulation d'urgence</li>
-        </ul>
-        
-        <h3>🔄 Workflow optimisé</h3>
-        <ol>
-            <li><strong>Batch :</strong> Préparez plusieurs sujets à la suite</li>
-            <li><strong>Thème :</strong> Choisissez un thème PDF par défaut</li>
-            <li><strong>Évaluation :</strong> Notez immédiatement après génération</li>
-            <li><strong>Organisation :</strong> Créez des sous-dossiers par matière</li>
-        </ol>
-        
-        <h3>📁 Organisation des fichiers</h3>
-        <pre>
-Documents/
-├── FicheGen/
-│   ├── guides/
-│   │   ├── guide_pedagogique_cp.pdf
-│   │   ├── guide_pedagogique_ce1.pdf
-│   │   └── toc_cache/ (automatique)
-│   └── fiches/
-│       ├── Sciences/
-│       ├── Mathematiques/
-│       └── Francais/
-        </pre>
-        
-        <h2>🎨 Personnalisation avancée</h2>
-        
-        <h3>🖨️ Choix du thème PDF</h3>
-        <ul>
-            <li><strong>Usage quotidien :</strong> Normal</li>
-            <li><strong>Inspection :</strong> Professionnel</li>
-            <li><strong>Cours ouverts :</strong> Esthétique</li>
-            <li><strong>Travail personnel :</strong> Minimal Pro</li>
-            <li><strong>Document officiel :</strong> Classic Serif</li>
-        </ul>
-        
-        <h3>✏️ Édition Markdown</h3>
-        <p>Activez "✏️ Edit Markdown" pour :</p>
-        <ul>
-            <li><strong>Titres :</strong> <code># Titre principal</code>, <code>## Sous-titre</code></li>
-            <li><strong>Listes :</strong> <code>- Point</code> ou <code>1. Numéroté</code></li>
-            <li><strong>Phases :</strong> <code>### Découverte (10 min)</code></li>
-            <li><strong>Emphase :</strong> <code>**gras**</code>, <code>*italique*</code></li>
-        </ul>
-        
-        <h2>🤖 Maîtriser les modèles IA</h2>
-        
-        <h3>🎛️ Température</h3>
-        <ul>
-            <li><strong>0.0-0.3 :</strong> Très structuré, prévisible</li>
-            <li><strong>0.4-0.6 :</strong> Équilibré (recommandé)</li>
-            <li><strong>0.7-1.0 :</strong> Créatif, varié</li>
-        </ul>
-        
-        <h3>🔄 Modèles par usage</h3>
-        <ul>
-            <li><strong>Gemini :</strong> Rapide, français excellent</li>
-            <li><strong>Gemma 2 27B :</strong> Éducation, très structuré</li>
-            <li><strong>DeepSeek :</strong> Créatif, approches originales</li>
-            <li><strong>Mistral :</strong> Équilibré, fiable</li>
-        </ul>
-        
-        <h3>📋 Instructions spéciales efficaces</h3>
-        <ul>
-            <li><strong>Adaptations :</strong> "Élèves en difficulté", "Classe nombreuse"</li>
-            <li><strong>Contraintes :</strong> "Pas de matériel spécialisé", "Sans vidéo"</li>
-            <li><strong>Style :</strong> "Plus d'exemples concrets", "Approche ludique"</li>
-            <li><strong>Format :</strong> "Activités courtes", "Moins de théorie"</li>
-        </ul>
-        
-        <h2>📊 Système d'évaluation</h2>
-        
-        <h3>⭐ Guide de notation</h3>
-        <ul>
-            <li><strong>5 étoiles :</strong> Fiche parfaite, utilisable directement</li>
-            <li><strong>4 étoiles :</strong> Très bonne, modifications mineures</li>
-            <li><strong>3 étoiles :</strong> Correcte, quelques ajustements</li>
-            <li><strong>2 étoiles :</strong> Utilisable mais nécessite du travail</li>
-            <li><strong>1 étoile :</strong> Inadéquate, à refaire</li>
-        </ul>
-        
-        <h3>🔄 Amélioration continue</h3>
-        <ul>
-            <li>Les fiches 4-5⭐ deviennent des exemples de style</li>
-            <li>L'IA apprend progressivement vos préférences</li>
-            <li>Notez même les fiches imparfaites pour l'apprentissage</li>
-        </ul>
-        
-        <h2>⚠️ Pièges à éviter</h2>
-        
-        <h3>🚫 Erreurs communes</h3>
-        <ul>
-            <li><strong>Sujet trop vague :</strong> "sciences" → précisez "le système solaire"</li>
-            <li><strong>Classe incorrecte :</strong> Vérifiez que le guide correspond</li>
-            <li><strong>Durée irréaliste :</strong> 20 min ou 90 min sont problématiques</li>
-            <li><strong>Pages incorrectes :</strong> Vérifiez avant de confirmer</li>
-        </ul>
-        
-        <h3>⚡ Optimisations</h3>
-        <ul>
-            <li><strong>Cache :</strong> Ne supprimez pas toc_cache sans raison</li>
-            <li><strong>Réseau :</strong> Générez par lots pour économiser les appels API</li>
-            <li><strong>Qualité :</strong> Préférez la précision à la vitesse</li>
-        </ul>
-        
-        <h2>🎓 Cas d'usage avancés</h2>
-        
-        <h3>👥 Travail collaboratif</h3>
-        <ul>
-            <li>Exportez en DOCX pour partage/modification</li>
-            <li>Standardisez les thèmes PDF par équipe</li>
-            <li>Partagez les instructions spéciales communes</li>
-        </ul>
-        
-        <h3>📈 Préparation d'inspection</h3>
-        <ul>
-            <li>Utilisez le thème "Professionnel"</li>
-            <li>Activez les banners métadonnées</li>
-            <li>Vérifiez la conformité au guide officiel</li>
-            <li>Préparez plusieurs fiches d'avance</li>
-        </ul>
-        
-        <h3>🔄 Adaptation rapide</h3>
-        <ul>
-            <li>Copiez/modifiez une fiche existante</li>
-            <li>Changez la classe et régénérez</li>
-            <li>Ajustez la durée selon le niveau</li>
-            <li>Personnalisez via instructions spéciales</li>
-        </ul>
-        """
-        self._show_help_dialog("Conseils et astuces", content)
+        self._open_help("tips")
 
     def _show_about(self):
         """Show about dialog"""
-        content = """
-        <div style="text-align: center; padding: 20px;">
-            <h1>🎓 FicheGen</h1>
-            <h2>Générateur intelligent de fiches pédagogiques</h2>
-            
-            <p style="font-size: 18px; margin: 30px 0;"><strong>Version 1.0</strong></p>
-            
-            <div style="background: #f5f5f5; padding: 20px; border-radius: 8px; margin: 20px 0;">
-                <h3>🎯 Mission</h3>
-                <p>FicheGen transforme la préparation de cours en assistant les enseignants marocains 
-                dans la création automatique de fiches pédagogiques de qualité professionnelle.</p>
-            </div>
-            
-            <h3>✨ Fonctionnalités principales</h3>
-            <ul style="text-align: left; max-width: 500px; margin: 0 auto;">
-                <li><strong>Analyse intelligente</strong> des guides pédagogiques</li>
-                <li><strong>Génération automatique</strong> de fiches structurées</li>
-                <li><strong>Multiple formats</strong> d'export (PDF, DOCX)</li>
-                <li><strong>Thèmes professionnels</strong> personnalisables</li>
-                <li><strong>Cache intelligent</strong> pour performance optimale</li>
-                <li><strong>Système d'évaluation</strong> et d'amélioration continue</li>
-            </ul>
-            
-            <div style="background: #e8f4fd; padding: 20px; border-radius: 8px; margin: 20px 0;">
-                <h3>🤖 Technologie IA</h3>
-                <p>Propulsé par des modèles d'intelligence artificielle de pointe :</p>
-                <ul style="text-align: left; max-width: 400px; margin: 0 auto;">
-                    <li>Google Gemini 2.5 Flash</li>
-                    <li>OpenRouter (Gemma, DeepSeek, Mistral, Llama)</li>
-                    <li>Fallback intelligent multi-modèles</li>
-                    <li>Spécialisation par tâche</li>
-                </ul>
-            </div>
-            
-            <h3>🎨 Interface</h3>
-            <p>Interface native macOS avec PyQt6, optimisée pour la productivité 
-            et l'expérience utilisateur moderne.</p>
-            
-            <div style="background: #f0f8f0; padding: 20px; border-radius: 8px; margin: 20px 0;">
-                <h3>📚 Compatibilité</h3>
-                <p><strong>Programmes marocains :</strong> CP, CE1, CE2, CM1, CM2, 6e, 5e, 4e, 3e<br>
-                <strong>Formats :</strong> PDF et DOCX<br>
-                <strong>Système :</strong> macOS 10.14+</p>
-            </div>
-            
-            <h3>🔒 Confidentialité</h3>
-            <p>Vos données et clés API restent strictement privées et locales. 
-            Aucune information n'est collectée ou transmise.</p>
-            
-            <div style="margin-top: 40px; font-size: 14px; color: #666;">
-                <p>Développé avec passion pour l'éducation marocaine 🇲🇦</p>
-                <p>© 2025 FicheGen - Tous droits réservés</p>
-            </div>
-        </div>
-        """
-        self._show_help_dialog("À propos de FicheGen", content)
+        self._open_help("about")
 
     def _on_model_toggle_changed(self):
         """Handle changes to the Gemini model toggle (Pro vs Flash)"""
         use_pro = self.model_toggle.isChecked()
-        self.settings.setValue("gemini_use_pro", "true" if use_pro else "false")
+        self._set_setting("gemini_use_pro", "true" if use_pro else "false")
         
         # Update the global model setting for immediate effect using configured models
-        new_model = get_configured_pro_model() if use_pro else get_configured_flash_model()
-        self.settings.setValue("advanced_gemini_model", new_model)
+        new_model = self._settings_cache["custom_pro_model" if use_pro else "custom_flash_model"]
+        self._set_setting("advanced_gemini_model", new_model)
         
         # Provide user feedback with actual model name
-        model_display = f"Pro ({get_configured_pro_model()})" if use_pro else f"Flash ({get_configured_flash_model()})"
+        model_display = f"Pro ({new_model})" if use_pro else f"Flash ({new_model})"
         self.append_log(f"🔄 Switched to {model_display}")
 
     def _on_student_textbook_toggle(self, checked):
         """Handle changes to the student textbook toggle"""
-        self.settings.setValue("use_student_textbook", "true" if checked else "false")
+        self._set_setting("use_student_textbook", "true" if checked else "false")
         status = "enabled" if checked else "disabled"
         self.append_log(f"📚 Student textbook extraction {status}")
 
     def _on_quick_preview_changed(self, checked):
         """Handle changes to the quick preview source setting"""
-        self.settings.setValue("preview_source", "true" if checked else "false")
+        self._set_setting("preview_source", "true" if checked else "false")
         status = "enabled" if checked else "disabled"
         self.append_log(f"🔄 Source preview {status}")
 
     def append_log(self, text):
-        self.log_edit.appendPlainText(text)
-        bar = self.log_edit.verticalScrollBar()
-        bar.setValue(bar.maximum())
+        self._log_buf.append(text)
+        if len(self._log_buf) >= _LOG_BUF_MAX_LINES:
+            self._flush_log_buf()
+        elif not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+
+    def _flush_log_buf(self):
+        """Write buffered log lines to the log view and log file in one batch"""
+        self._log_flush_timer.stop()
+        if not self._log_buf:
+            return
+        lines = list(self._log_buf)
+        self._log_buf.clear()
+        self.log_edit.appendPlainText("\n".join(lines))
+        self.log_edit.moveCursor(QtGui.QTextCursor.MoveOperation.End)
+        self.log_edit.ensureCursorVisible()
+        if self.log_file_handle:
+            ts = QtCore.QDateTime.currentDateTime().toString(QtCore.Qt.DateFormat.ISODateWithMs)
+            self._log_writer_queue.put((self.log_file_handle, ts, lines))
+
+    def _close_log_file(self):
+        """Flush pending log lines and hand the run log to the writer thread to sync and close"""
+        self._flush_log_buf()
         if self.log_file_handle:
+            self._log_writer_queue.put((self.log_file_handle, None, None))
+            self.log_file_handle = None
+
+    def _log_writer_loop(self):
+        """Write queued log batches to their run log files off the UI thread"""
+        log_queue = self._log_writer_queue
+        pending = None
+        while True:
+            item = pending if pending is not None else log_queue.get()
+            pending = None
+            if item is None:
+                return
+            handle, ts, lines = item
             try:
-                self.log_file_handle.write(f"{datetime.now().isoformat()} | {text}\n")
-                self.log_file_handle.flush()
-            except Exception:
+                if lines is None:
+                    # End of run: sync the file to disk and close it
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                    handle.close()
+                    continue
+                # Fold every batch already queued for this file into a single write
+                parts = [f"{ts} | {line}\n" for line in lines]
+                while True:
+                    try:
+                        pending = log_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if pending is None or pending[0] is not handle or pending[2] is None:
+                        break
+                    _, ts, lines = pending
+                    parts.extend([f"{ts} | {line}\n" for line in lines])
+                    pending = None
+                handle.write("".join(parts))
+            except (IOError, OSError, ValueError):
                 pass
 
+    def _settings_writer_loop(self):
+        """Apply queued (key, value) settings writes off the UI thread; _SETTINGS_SYNC syncs, None syncs and stops."""
+        settings = QtCore.QSettings("FicheGen", "Pedago")
+        while True:
+            item = self._settings_writer_queue.get()
+            if item is None or item is _SETTINGS_SYNC:
+                settings.sync()
+                if settings.status() != QtCore.QSettings.Status.NoError:
+                    self._settings_write_failed.emit(f"⚠️ Could not save settings: {settings.status().name}")
+                if item is None:
+                    return
+                continue
+            if isinstance(item, threading.Event):
+                # _wait_for_settings_writes: everything queued before it has been applied
+                item.set()
+                continue
+            try:
+                settings.setValue(*item)
+            except Exception as e:
+                self._settings_write_failed.emit(f"⚠️ Could not save setting '{item[0]}': {e}")
+
     def start_generation(self):
         """Start fiche generation with comprehensive validation and worker setup."""
         # Check if already running
@@ -2160,9 +1918,10 @@ Documents/
             return
 
         # Get settings from preferences
-        guides_dir = self.settings.value("input_dir", DEFAULT_INPUT_DIR)
-        textbook_dir = self.settings.value("textbook_dir", "") or None
-        output_dir = self.settings.value("output_dir", DEFAULT_OUTPUT_DIR)
+        s = self._settings_cache
+        guides_dir = s["input_dir"]
+        textbook_dir = s["textbook_dir"] or None
+        output_dir = s["output_dir"]
         
         # Validate directories
         if not os.path.isdir(guides_dir):
@@ -2178,7 +1937,7 @@ Documents/
             return
         
         try:
-            os.makedirs(output_dir, exist_ok=True)
+            _ensure_dir(output_dir)
         except (OSError, PermissionError) as e:
             QtWidgets.QMessageBox.warning(
                 self, 
@@ -2188,10 +1947,10 @@ Documents/
             return
 
         # Get other settings from preferences
-        temperature = float(self.settings.value("temperature", "0.5"))
-        use_top_examples = self.settings.value("use_top_examples", "true") == "true"
-        preview_source = self.settings.value("preview_source", "false") == "true"
-        special_instructions = self.settings.value("special_instructions", "")
+        temperature = float(s["temperature"])
+        use_top_examples = s["use_top_examples"] == "true"
+        preview_source = s["preview_source"] == "true"
+        special_instructions = s["special_instructions"]
         
         # Get settings from sidebar
         pages_override = self.pages_edit.text()
@@ -2199,28 +1958,28 @@ Documents/
         # Apply default subject if current is empty
         subject = self.subject_combo.currentText().strip()
         if not subject:
-            subject = self.settings.value("default_subject", "").strip() or None
+            subject = s["default_subject"].strip() or None
 
         # UI state
         self.generate_btn.setEnabled(False)
         self.cancel_btn.setEnabled(True)
         self.progress.setValue(0)
         self.status_label.setText("Starting generation...")
+        self._log_buf.clear()
         self.log_edit.clear()
         # Reset both editor and preview
         self.preview_editor.clear()
         self.preview_edit.clear()
+        self._md_last_hash = None
         self.current_content = ""
-        self.save_pdf_btn.setEnabled(False)
-        self.save_docx_btn.setEnabled(False)
-        self._set_rating_enabled(False)
+        self._update_save_states(False)
 
         # Prepare log file if enabled
-        if self.settings.value("save_logs", "false") == "true":
+        if self._settings_cache["save_logs"] == "true":
             try:
-                os.makedirs("logs", exist_ok=True)
+                _ensure_dir("logs")
                 fname = datetime.now().strftime("logs/run_%Y%m%d_%H%M%S.txt")
-                self.log_file_handle = open(fname, "a", encoding="utf-8")
+                self.log_file_handle = open(fname, "a", encoding="utf-8", buffering=_LOG_FILE_BUFFERING)
                 self.append_log(f"📝 Logging to {fname}")
             except Exception as e:
                 self.append_log(f"⚠️ Could not open log file: {e}")
@@ -2245,7 +2004,10 @@ Documents/
         self.worker.content.connect(self.on_content_ready)
         self.worker.done.connect(self.on_done)
         self.worker.enable_buttons.connect(self.on_enable_buttons)
+        self.worker.finished.connect(self._on_worker_finished)
         self.worker.request_source_preview.connect(self.show_source_preview_dialog)
+        # Workers read some settings straight from QSettings
+        self._wait_for_settings_writes()
         self.worker.start()
 
     def start_evaluation_generation(self):
@@ -2284,11 +2046,11 @@ Documents/
         max_score = 10 if self.eval_max_score_10.isChecked() else 20
         
         # Save settings for next time
-        self.settings.setValue("eval_school_name", school_name)
-        self.settings.setValue("eval_academic_year", academic_year)
-        self.settings.setValue("eval_number", str(eval_number))
-        self.settings.setValue("eval_semester", semester)
-        self.settings.setValue("eval_max_score", str(max_score))
+        self._set_setting("eval_school_name", school_name)
+        self._set_setting("eval_academic_year", academic_year)
+        self._set_setting("eval_number", str(eval_number))
+        self._set_setting("eval_semester", semester)
+        self._set_setting("eval_max_score", str(max_score))
 
         manual_topics = [
             line.strip() 
@@ -2302,10 +2064,7 @@ Documents/
         ]
 
         # Deduplicate topics while preserving order
-        topics_set = []
-        for topic in manual_topics + selected_topics:
-            if topic and topic not in topics_set:
-                topics_set.append(topic)
+        topics_set = list(dict.fromkeys(manual_topics + selected_topics))
 
         if not topics_set:
             QtWidgets.QMessageBox.warning(
@@ -2363,10 +2122,10 @@ Documents/
                                  model_name, temperature, formatting_options, extra_instructions, eval_metadata):
         """Start the evaluation generation worker."""
         # Get settings from preferences
-        output_dir = self.settings.value("output_dir", DEFAULT_OUTPUT_DIR)
+        output_dir = self._settings_cache["output_dir"]
         
         try:
-            os.makedirs(output_dir, exist_ok=True)
+            _ensure_dir(output_dir)
         except Exception as e:
             QtWidgets.QMessageBox.warning(self, "Output folder error", 
                 f"Could not create output folder:\n{e}")
@@ -2378,21 +2137,21 @@ Documents/
         self.cancel_btn.setEnabled(True)
         self.progress.setValue(0)
         self.status_label.setText("Starting evaluation generation...")
+        self._log_buf.clear()
         self.log_edit.clear()
         # Reset both editor and preview
         self.preview_editor.clear()
         self.preview_edit.clear()
+        self._md_last_hash = None
         self.current_content = ""
-        self.save_pdf_btn.setEnabled(False)
-        self.save_docx_btn.setEnabled(False)
-        self._set_rating_enabled(False)
+        self._update_save_states(False)
 
         # Prepare log file if enabled
-        if self.settings.value("save_logs", "false") == "true":
+        if self._settings_cache["save_logs"] == "true":
             try:
-                os.makedirs("logs", exist_ok=True)
+                _ensure_dir("logs")
                 fname = datetime.now().strftime("logs/eval_%Y%m%d_%H%M%S.txt")
-                self.log_file_handle = open(fname, "a", encoding="utf-8")
+                self.log_file_handle = open(fname, "a", encoding="utf-8", buffering=_LOG_FILE_BUFFERING)
                 self.append_log(f"📝 Logging to {fname}")
             except Exception as e:
                 self.append_log(f"⚠️ Could not open log file: {e}")
@@ -2410,8 +2169,8 @@ Documents/
                 num_images = self.eval_images_count_spin.value()
         
         # Get guides directory from settings
-        guides_dir = self.settings.value("input_dir", DEFAULT_INPUT_DIR)
-        textbook_dir = self.settings.value("textbook_dir", "")
+        guides_dir = self._settings_cache["input_dir"]
+        textbook_dir = self._settings_cache["textbook_dir"]
         
         self.worker = EvaluationWorker(
             class_level=class_level,
@@ -2438,28 +2197,17 @@ Documents/
         self.worker.content.connect(self.on_content_ready)
         self.worker.done.connect(self.on_done)
         self.worker.enable_buttons.connect(self.on_enable_buttons)
+        self.worker.finished.connect(self._on_worker_finished)
         self.worker.request_source_preview.connect(self.show_source_preview_dialog)
-        self.worker.enable_buttons.connect(self.on_enable_buttons)
         
         # Start evaluation generation
+        # Workers read some settings straight from QSettings
+        self._wait_for_settings_writes()
         self.worker.start()
 
-    def show_source_preview_dialog(self, source_text: str, prompt_text: str = ""):
-        """Shows a resizable modal dialog for the user to confirm the extracted source text or evaluation details."""
+    def _build_source_preview_dialog(self):
+        """Build the source preview dialog once; its texts are refreshed on every request."""
         dialog = QtWidgets.QDialog(self)
-        
-        # Check if this is an evaluation or fiche generation
-        is_evaluation = isinstance(self.worker, EvaluationWorker)
-        
-        if is_evaluation:
-            dialog.setWindowTitle("Confirm Evaluation Details & AI Prompt")
-            instructions_text = "Review the evaluation details and the prompt that will be sent to AI. Click Continue to generate the evaluation:"
-            first_tab_title = "📝 Evaluation Details"
-        else:
-            dialog.setWindowTitle("Confirm Source Text & AI Prompt")
-            instructions_text = "This is the text extracted from the PDF and the prompt that will be sent to AI. Review and confirm:"
-            first_tab_title = "📄 Extracted Text"
-        
         dialog.setModal(True)
         dialog.resize(900, 700)  # Larger for two text areas
         
@@ -2467,69 +2215,114 @@ Documents/
         layout = QtWidgets.QVBoxLayout(dialog)
         
         # Instructions
-        label = QtWidgets.QLabel(instructions_text)
-        label.setWordWrap(True)
-        layout.addWidget(label)
+        self._src_preview_label = QtWidgets.QLabel()
+        self._src_preview_label.setWordWrap(True)
+        layout.addWidget(self._src_preview_label)
         
         # Tab widget for source text and prompt
-        tab_widget = QtWidgets.QTabWidget()
+        self._src_preview_tabs = QtWidgets.QTabWidget()
         
         # Source text/evaluation details tab
         source_tab = QtWidgets.QWidget()
         source_layout = QtWidgets.QVBoxLayout(source_tab)
-        source_text_edit = QtWidgets.QTextEdit()
-        source_text_edit.setPlainText(source_text)
-        source_text_edit.setReadOnly(True)
-        source_text_edit.setFont(QtGui.QFont("monospace", 10))
-        source_layout.addWidget(source_text_edit)
-        tab_widget.addTab(source_tab, first_tab_title)
+        self._src_text_edit = QtWidgets.QTextEdit()
+        self._src_text_edit.setReadOnly(True)
+        self._src_text_edit.setFont(_mono_font(10))
+        source_layout.addWidget(self._src_text_edit)
+        self._src_preview_tabs.addTab(source_tab, "")
         
-        # Prompt tab (if available)
-        if prompt_text:
-            prompt_tab = QtWidgets.QWidget()
-            prompt_layout = QtWidgets.QVBoxLayout(prompt_tab)
-            
-            # Prompt text area
-            prompt_text_edit = QtWidgets.QTextEdit()
-            prompt_text_edit.setPlainText(prompt_text)
-            prompt_text_edit.setReadOnly(True)
-            prompt_text_edit.setFont(QtGui.QFont("monospace", 9))
-            prompt_layout.addWidget(prompt_text_edit)
-            
-            # Copy prompt button
-            copy_layout = QtWidgets.QHBoxLayout()
-            copy_prompt_btn = QtWidgets.QPushButton("📋 Copy Full Prompt")
-            copy_prompt_btn.clicked.connect(lambda: self._copy_prompt_to_clipboard(prompt_text))
-            copy_layout.addWidget(copy_prompt_btn)
-            copy_layout.addStretch()
-            
-            # Manual input button for both fiches and evaluations
-            manual_input_btn = QtWidgets.QPushButton("✏️ Paste Your Own Markdown")
-            manual_input_btn.clicked.connect(lambda: self._show_manual_input_dialog(dialog))
-            copy_layout.addWidget(manual_input_btn)
-            
-            prompt_layout.addLayout(copy_layout)
-            tab_widget.addTab(prompt_tab, "🤖 AI Prompt")
+        # Prompt tab, filled in the first time it is shown
+        self._prompt_tab = QtWidgets.QWidget()
+        self._prompt_text_edit = None
+        self._src_preview_tabs.currentChanged.connect(self._on_source_preview_tab_changed)
         
-        layout.addWidget(tab_widget)
+        layout.addWidget(self._src_preview_tabs)
         
         # Buttons
         button_layout = QtWidgets.QHBoxLayout()
         button_layout.addStretch()
         
-        continue_text = "Generate Evaluation" if is_evaluation else "Continue Generation"
-        continue_btn = QtWidgets.QPushButton(continue_text)
-        continue_btn.setDefault(True)
+        self._src_continue_btn = QtWidgets.QPushButton()
+        self._src_continue_btn.setDefault(True)
         cancel_btn = QtWidgets.QPushButton("Cancel")
         
-        button_layout.addWidget(continue_btn)
+        button_layout.addWidget(self._src_continue_btn)
         button_layout.addWidget(cancel_btn)
         layout.addLayout(button_layout)
         
         # Connect buttons
-        continue_btn.clicked.connect(dialog.accept)
+        self._src_continue_btn.clicked.connect(dialog.accept)
         cancel_btn.clicked.connect(dialog.reject)
         
+        return dialog
+
+    def _build_prompt_tab(self):
+        """Create the prompt tab's widgets on first visit."""
+        prompt_layout = QtWidgets.QVBoxLayout(self._prompt_tab)
+        
+        # Prompt text area
+        self._prompt_text_edit = QtWidgets.QTextEdit()
+        self._prompt_text_edit.setReadOnly(True)
+        self._prompt_text_edit.setFont(_mono_font(9))
+        prompt_layout.addWidget(self._prompt_text_edit)
+        
+        # Copy prompt button
+        copy_layout = QtWidgets.QHBoxLayout()
+        copy_prompt_btn = QtWidgets.QPushButton("📋 Copy Full Prompt")
+        copy_prompt_btn.clicked.connect(lambda: self._copy_prompt_to_clipboard(self._src_preview_prompt))
+        copy_layout.addWidget(copy_prompt_btn)
+        copy_layout.addStretch()
+        
+        # Manual input button for both fiches and evaluations
+        manual_input_btn = QtWidgets.QPushButton("✏️ Paste Your Own Markdown")
+        manual_input_btn.clicked.connect(lambda: self._show_manual_input_dialog(self._source_preview_dialog))
+        copy_layout.addWidget(manual_input_btn)
+        
+        prompt_layout.addLayout(copy_layout)
+
+    def _on_source_preview_tab_changed(self, index):
+        """Populate the prompt tab only when the user opens it."""
+        if self._src_preview_tabs.widget(index) is not self._prompt_tab:
+            return
+        if self._prompt_text_edit is None:
+            self._build_prompt_tab()
+        if self._prompt_text_shown != self._src_preview_prompt:
+            _set_plain_text_chunked(self._prompt_text_edit, self._src_preview_prompt)
+            self._prompt_text_shown = self._src_preview_prompt
+
+    def show_source_preview_dialog(self, source_text: str, prompt_text: str = ""):
+        """Shows a resizable modal dialog for the user to confirm the extracted source text or evaluation details."""
+        if self._source_preview_dialog is None:
+            self._source_preview_dialog = self._build_source_preview_dialog()
+        dialog = self._source_preview_dialog
+        
+        # Check if this is an evaluation or fiche generation
+        is_evaluation = isinstance(self.worker, EvaluationWorker)
+        
+        if is_evaluation:
+            dialog.setWindowTitle("Confirm Evaluation Details & AI Prompt")
+            instructions_text = "Review the evaluation details and the prompt that will be sent to AI. Click Continue to generate the evaluation:"
+            first_tab_title = "📝 Evaluation Details"
+        else:
+            dialog.setWindowTitle("Confirm Source Text & AI Prompt")
+            instructions_text = "This is the text extracted from the PDF and the prompt that will be sent to AI. Review and confirm:"
+            first_tab_title = "📄 Extracted Text"
+        
+        self._src_preview_label.setText(instructions_text)
+        self._src_preview_tabs.setTabText(0, first_tab_title)
+        self._src_preview_tabs.setCurrentIndex(0)
+        _set_plain_text_chunked(self._src_text_edit, source_text)
+        
+        # Prompt tab (if available)
+        self._src_preview_prompt = prompt_text
+        prompt_index = self._src_preview_tabs.indexOf(self._prompt_tab)
+        if prompt_text and prompt_index == -1:
+            self._src_preview_tabs.addTab(self._prompt_tab, "🤖 AI Prompt")
+        elif not prompt_text and prompt_index != -1:
+            self._src_preview_tabs.removeTab(prompt_index)
+        
+        self._src_continue_btn.setText("Generate Evaluation" if is_evaluation else "Continue Generation")
+        
         # Show dialog and handle result
         result = dialog.exec() if PYQT6 else dialog.exec_()
         
@@ -2580,7 +2373,7 @@ Documents/
         # Text area for markdown input
         text_edit = QtWidgets.QTextEdit()
         text_edit.setPlaceholderText("Paste your markdown content here...")
-        text_edit.setFont(QtGui.QFont("monospace", 10))
+        text_edit.setFont(_mono_font(10))
         layout.addWidget(text_edit)
         
         # Buttons
@@ -2620,55 +2413,62 @@ Documents/
     def on_preview_edit_toggled(self, checked: bool):
         # Switch between rendered preview (0) and raw editor (1)
         self.preview_stack.setCurrentIndex(1 if checked else 0)
-        if not checked:
-            # Leaving edit mode: sync preview from editor
+        if not checked and self._md_dirty:
+            # Leaving edit mode: render the edits made while the preview was hidden
+            self._md_debounce.stop()
+            self._md_dirty = False
             text = self.preview_editor.toPlainText()
             self.current_content = text
-            try:
-                self.preview_edit.setMarkdown(text)
-            except Exception:
-                self.preview_edit.setPlainText(text)
+            self._render_markdown(text)
         # Enable save buttons if there's content
-        can_save = bool(self.get_current_markdown().strip())
-        self.save_pdf_btn.setEnabled(can_save)
-        self.save_docx_btn.setEnabled(can_save and HAS_DOCX)
-        self._set_rating_enabled(can_save)
+        can_save = _has_text(self.get_current_markdown())
+        self._update_save_states(can_save)
+
+    def _render_markdown(self, text: str):
+        """Render text into the preview, skipping it when it is what's already shown"""
+        text_hash = hash(text)
+        if text_hash == self._md_last_hash:
+            return
+        try:
+            self.preview_edit.setMarkdown(text)
+        except Exception:
+            self.preview_edit.setPlainText(text)
+        self._md_last_hash = text_hash
+
+    def _rerender_markdown(self):
+        self._render_markdown(self.preview_editor.toPlainText())
 
     def on_editor_text_changed(self):
-        # Live sync current content and rendered preview if in edit mode
+        # Live sync current content; the rendered preview is only refreshed while it is visible
         text = self.preview_editor.toPlainText()
         self.current_content = text
         if self.preview_edit_toggle.isChecked():
-            try:
-                self.preview_edit.setMarkdown(text)
-            except Exception:
-                self.preview_edit.setPlainText(text)
-        can_save = bool(text.strip())
-        self.save_pdf_btn.setEnabled(can_save)
-        self.save_docx_btn.setEnabled(can_save and HAS_DOCX)
-        self._set_rating_enabled(can_save)
+            self._md_dirty = True
+        else:
+            self._md_debounce.start()
+        can_save = _has_text(text)
+        self._update_save_states(can_save)
 
     def on_content_ready(self, content):
         # Show in preview and enable Save & Rating
         self.current_content = content or ""
         # Populate both the preview (rendered) and editor (raw)
-        self.preview_editor.blockSignals(True)
-        self.preview_editor.setPlainText(self.current_content)
-        self.preview_editor.blockSignals(False)
+        blocker = QtCore.QSignalBlocker(self.preview_editor)
         try:
-            self.preview_edit.setMarkdown(self.current_content)
-        except Exception:
-            self.preview_edit.setPlainText(self.current_content)
-        can_save = bool(self.current_content.strip())
-        self.save_pdf_btn.setEnabled(can_save)
-        self.save_docx_btn.setEnabled(can_save and HAS_DOCX)
-        self._set_rating_enabled(can_save)
+            _set_plain_text_chunked(self.preview_editor, self.current_content)
+        finally:
+            blocker.unblock()
+        self._md_debounce.stop()
+        self._render_markdown(self.current_content)
+        can_save = _has_text(self.current_content)
+        self._update_save_states(can_save)
         # Switch to Preview tab for wow factor
         self.right_tabs.setCurrentWidget(self.preview_tab)
 
     def get_current_markdown(self) -> str:
-        # If editing, source of truth is the editor; else use current_content
-        return self.preview_editor.toPlainText() if self.preview_edit_toggle.isChecked() else (self.current_content or "")
+        # on_editor_text_changed keeps current_content in step with the editor, so the
+        # editor document never needs to be re-serialized here
+        return self.current_content or ""
 
     def save_current_rating(self):
         content = (self.get_current_markdown() or "").strip()
@@ -2697,22 +2497,17 @@ Documents/
             self.append_log("⏹️ Cancel requested. Stopping at the next safe checkpoint...")
             self.append_log("ℹ️ Note: If AI is currently generating, cancellation will occur after the API call completes.")
             self.cancel_btn.setEnabled(False)
-            
-            # Give worker time to finish gracefully (non-blocking)
-            QtCore.QTimer.singleShot(100, self._check_worker_stopped)
+            # The worker's finished signal cleans it up once it stops
 
-    def _check_worker_stopped(self):
-        """Periodically check if worker has stopped after cancel request."""
-        if self.worker is not None:
-            if self.worker.isRunning():
-                # Still running, check again in 100ms
-                QtCore.QTimer.singleShot(100, self._check_worker_stopped)
-            else:
-                # Worker finished, clean up
-                self._cleanup_worker()
+    def _on_worker_finished(self):
+        """Clean up the worker once its thread has exited."""
+        # Ignore a stale worker that has already been replaced by a new run
+        if self.sender() is self.worker:
+            self._cleanup_worker()
 
     def _cleanup_worker(self):
         """Clean up worker thread safely."""
+        self._flush_log_buf()
         if self.worker is not None:
             try:
                 # Disconnect all signals to prevent late emissions
@@ -2748,156 +2543,149 @@ Documents/
         self.generate_eval_btn.setEnabled(True)
         self.cancel_btn.setEnabled(False)
         
-        # Close log file handle
-        if self.log_file_handle:
-            try:
-                self.log_file_handle.flush()
-                self.log_file_handle.close()
-            except (IOError, OSError):
-                pass
-            finally:
-                self.log_file_handle = None
-        
-        # Clean up worker after brief delay to ensure all signals processed
-        QtCore.QTimer.singleShot(500, self._cleanup_worker)
+        # Close log file handle; the worker itself is cleaned up by _on_worker_finished,
+        # which Qt delivers after every signal the thread emitted
+        self._close_log_file()
+
+    def _choose_folder(self, title: str, setting_key: str):
+        """Open a non-blocking folder picker; the chosen folder is stored under setting_key."""
+        dlg = QtWidgets.QFileDialog(self, title)
+        dlg.setFileMode(FILEMODE_DIR)
+        dlg.setOption(OPT_SHOWDIRSONLY, True)
+        dlg.setOption(OPT_DONTRESOLVESYMLINKS, True)
+        dlg.setAttribute(QtCore.Qt.WidgetAttribute.WA_DeleteOnClose)
+        dlg.fileSelected.connect(lambda selected: self._on_folder_chosen(setting_key, selected))
+        dlg.open()
+
+    def _on_folder_chosen(self, setting_key: str, selected: str):
+        if not selected:
+            return
+        self._set_setting(setting_key, selected)
+        self._schedule_save()
+        if setting_key == "input_dir":
+            # Refresh available lessons for the new guides folder
+            self._load_available_lessons()
 
     def choose_textbook_folder(self):
-        dlg = QtWidgets.QFileDialog(self, "Choose textbooks folder")
-        dlg.setFileMode(QtWidgets.QFileDialog.FileMode.Directory if PYQT6 else QtWidgets.QFileDialog.Directory)
-        dlg.setOption(QtWidgets.QFileDialog.Option.ShowDirsOnly if PYQT6 else QtWidgets.QFileDialog.ShowDirsOnly, True)
-        if dlg.exec():
-            selected = dlg.selectedFiles()[0]
-            self.textbook_edit.setText(selected)
-            self._save_settings()
+        self._choose_folder("Choose textbooks folder", "textbook_dir")
 
     def choose_input_folder(self):
-        dlg = QtWidgets.QFileDialog(self, "Choose input folder (guides)")
-        dlg.setFileMode(QtWidgets.QFileDialog.FileMode.Directory if PYQT6 else QtWidgets.QFileDialog.Directory)
-        dlg.setOption(QtWidgets.QFileDialog.Option.ShowDirsOnly if PYQT6 else QtWidgets.QFileDialog.ShowDirsOnly, True)
-        if dlg.exec():
-            selected = dlg.selectedFiles()[0]
-            self.input_edit.setText(selected)
-            self._save_settings()
+        self._choose_folder("Choose input folder (guides)", "input_dir")
 
     def choose_output_folder(self):
-        dlg = QtWidgets.QFileDialog(self, "Choose output folder")
-        dlg.setFileMode(QtWidgets.QFileDialog.FileMode.Directory if PYQT6 else QtWidgets.QFileDialog.Directory)
-        dlg.setOption(QtWidgets.QFileDialog.Option.ShowDirsOnly if PYQT6 else QtWidgets.QFileDialog.ShowDirsOnly, True)
-        if dlg.exec():
-            selected = dlg.selectedFiles()[0]
-            self.output_edit.setText(selected)
-            self._save_settings()
+        self._choose_folder("Choose output folder", "output_dir")
 
     def _is_current_content_evaluation(self):
         """Check if the current content is an evaluation based on the worker type"""
         return isinstance(getattr(self, 'worker', None), EvaluationWorker)
 
     def save_current_pdf(self):
-        md = self.get_current_markdown().strip()
-        if not md:
+        md = self.get_current_markdown()
+        if not _has_text(md):
             content_type = "evaluation" if self._is_current_content_evaluation() else "fiche"
             QtWidgets.QMessageBox.information(self, "Nothing to save", f"Generate a {content_type} first.")
             return
+        if self._export_busy():
+            return
+        md = md.strip()
         
-        output_dir = (self.settings.value("output_dir", DEFAULT_OUTPUT_DIR) or DEFAULT_OUTPUT_DIR).strip()
+        output_dir = self._get_path_setting("output_dir", DEFAULT_OUTPUT_DIR)
         
         class_level = self.class_combo.currentText()
         
-        template_name = self.pdf_template_combo.currentText() or self.settings.value("default_pdf_style", list(PDF_TEMPLATES.keys())[0])
+        template_name = self.pdf_template_combo.currentText() or self._get_setting("default_pdf_style")
         
         subject = self.subject_combo.currentText().strip() if getattr(self, 'use_subject_chk', None) and self.use_subject_chk.isChecked() else None
-            
-        class UQ:
-            def __init__(uqself, outer): uqself.outer = outer
-            def put(uqself, item):
-                try:
-                    k, v = item
-                    if k == "log": self.append_log(v)
-                except Exception:
-                    pass
 
         # Honor user preference for meta banner
-        show_meta = self.settings.value("pdf_show_meta", "false") == "true"
-        # Temporarily inject preference into template
-        orig_show = PDF_TEMPLATES.get(template_name, {}).get("show_meta_banner")
-        if template_name in PDF_TEMPLATES:
-            PDF_TEMPLATES[template_name]["show_meta_banner"] = show_meta
+        show_meta = self._get_setting("pdf_show_meta") == "true"
         
-        try:
-            if self._is_current_content_evaluation():
-                # For evaluations, get topics from the worker
-                topics_list = getattr(self.worker, 'topics_list', ['Unknown'])
-                path = save_evaluation_to_pdf(md, topics_list, class_level, output_dir, UQ(self), template_name, subject)
-            else:
-                # For fiches, use lesson topic
-                lesson_topic = self.topic_edit.text().strip()
-                path = save_fiche_to_pdf(md, lesson_topic, class_level, output_dir, UQ(self), template_name, subject)
-        except Exception as e:
-            self.append_log(f"❌ PDF Save Error: {e}")
-            import traceback
-            self.append_log(f"Stack trace: {traceback.format_exc()}")
-            QtWidgets.QMessageBox.critical(self, "PDF Save Failed", f"Failed to save PDF:\n{str(e)}\n\nCheck the log for details.")
-            return
-        finally:
-            # restore
-            if template_name in PDF_TEMPLATES and orig_show is not None:
-                PDF_TEMPLATES[template_name]["show_meta_banner"] = orig_show
+        # Read everything the export needs here; it runs on an ExportWorker thread
+        is_evaluation = self._is_current_content_evaluation()
+        # For evaluations, get topics from the worker; for fiches, use lesson topic
+        topics_list = getattr(self.worker, 'topics_list', ['Unknown'])
+        lesson_topic = self.topic_edit.text().strip()
+
+        def export(queue):
+            if is_evaluation:
+                return save_evaluation_to_pdf(md, topics_list, class_level, output_dir, queue, template_name, subject, show_meta=show_meta)
+            return save_fiche_to_pdf(md, lesson_topic, class_level, output_dir, queue, template_name, subject, show_meta=show_meta)
         
-        if path:
-            content_type = "Evaluation" if self._is_current_content_evaluation() else "Fiche"
-            self.append_log(f"🎉 {content_type} PDF export complete.")
-            QtWidgets.QMessageBox.information(self, "Saved", f"{content_type} PDF exported to:\n{path}")
+        self._start_export("PDF", "Evaluation" if is_evaluation else "Fiche", export)
 
     def save_current_docx(self):
-        md = self.get_current_markdown().strip()
-        if not md:
+        md = self.get_current_markdown()
+        if not _has_text(md):
             content_type = "evaluation" if self._is_current_content_evaluation() else "fiche"
             QtWidgets.QMessageBox.information(self, "Nothing to save", f"Generate a {content_type} first.")
             return
         if not HAS_DOCX:
             QtWidgets.QMessageBox.warning(self, "Missing dependency", "Install python-docx to export DOCX:\n\npip install python-docx")
             return
+        if self._export_busy():
+            return
+        md = md.strip()
         
-        output_dir = (self.settings.value("output_dir", DEFAULT_OUTPUT_DIR) or DEFAULT_OUTPUT_DIR).strip()
+        output_dir = self._get_path_setting("output_dir", DEFAULT_OUTPUT_DIR)
         class_level = self.class_combo.currentText()
 
-        class UQ:
-            def __init__(uqself, outer): uqself.outer = outer
-            def put(uqself, item):
-                try:
-                    k, v = item
-                    if k == "log": self.append_log(v)
-                except Exception:
-                    pass
+        # Read everything the export needs here; it runs on an ExportWorker thread
+        is_evaluation = self._is_current_content_evaluation()
+        # For evaluations, get topics from the worker; for fiches, use lesson topic
+        topics_list = getattr(self.worker, 'topics_list', ['Unknown'])
+        lesson_topic = self.topic_edit.text().strip()
 
-        try:
-            if self._is_current_content_evaluation():
-                # For evaluations, get topics from the worker
-                topics_list = getattr(self.worker, 'topics_list', ['Unknown'])
-                path = save_evaluation_to_docx(md, topics_list, class_level, output_dir, UQ(self))
-            else:
-                # For fiches, use lesson topic
-                lesson_topic = self.topic_edit.text().strip()
-                path = save_fiche_to_docx(md, lesson_topic, class_level, output_dir, UQ(self))
-        except Exception as e:
-            self.append_log(f"❌ DOCX Save Error: {e}")
-            import traceback
-            self.append_log(f"Stack trace: {traceback.format_exc()}")
-            QtWidgets.QMessageBox.critical(self, "DOCX Save Failed", f"Failed to save DOCX:\n{str(e)}\n\nCheck the log for details.")
+        def export(queue):
+            if is_evaluation:
+                return save_evaluation_to_docx(md, topics_list, class_level, output_dir, queue)
+            return save_fiche_to_docx(md, lesson_topic, class_level, output_dir, queue)
+        
+        self._start_export("DOCX", "Evaluation" if is_evaluation else "Fiche", export)
+
+    def _export_running(self) -> bool:
+        """True while an ExportWorker is still writing a file."""
+        return self._export_worker is not None and self._export_worker.isRunning()
+
+    def _export_busy(self) -> bool:
+        """True (after telling the user) if an export is still running."""
+        if not self._export_running():
+            return False
+        QtWidgets.QMessageBox.information(self, "Export in progress", "Please wait for the current export to finish.")
+        return True
+
+    def _start_export(self, kind: str, content_type: str, export):
+        """Run export(queue) on an ExportWorker, keeping the save buttons off until it finishes."""
+        self.save_pdf_btn.setEnabled(False)
+        self.save_docx_btn.setEnabled(False)
+        
+        self._export_worker = ExportWorker(export)
+        self._export_worker.log.connect(self.append_log)
+        self._export_worker.export_done.connect(
+            lambda path, error, trace: self._on_export_finished(kind, content_type, path, error, trace)
+        )
+        self._export_worker.start()
+
+    def _on_export_finished(self, kind: str, content_type: str, path: str, error: str, trace: str):
+        """Report the outcome of an ExportWorker run and re-enable saving."""
+        self.save_pdf_btn.setEnabled(self._save_state)
+        self.save_docx_btn.setEnabled(self._save_state and self._docx_enabled)
+        
+        if error:
+            self.append_log(f"❌ {kind} Save Error: {error}")
+            self.append_log(f"Stack trace: {trace}")
+            QtWidgets.QMessageBox.critical(self, f"{kind} Save Failed", f"Failed to save {kind}:\n{error}\n\nCheck the log for details.")
             return
         
         if path:
-            content_type = "Evaluation" if self._is_current_content_evaluation() else "Fiche"
-            self.append_log(f"🎉 {content_type} DOCX export complete.")
-            QtWidgets.QMessageBox.information(self, "Saved", f"{content_type} DOCX exported to:\n{path}")
+            self.append_log(f"🎉 {content_type} {kind} export complete.")
+            QtWidgets.QMessageBox.information(self, "Saved", f"{content_type} {kind} exported to:\n{path}")
 
     def clear_preview(self):
         self.preview_editor.clear()
         self.preview_edit.clear()
+        self._md_last_hash = None
         self.preview_edit_toggle.setChecked(False)
-        self.save_pdf_btn.setEnabled(False)
-        self.save_docx_btn.setEnabled(False)
-        self._set_rating_enabled(False)
+        self._update_save_states(False)
         self.current_content = ""
 
     def _load_settings(self):
@@ -2905,62 +2693,75 @@ Documents/
         load_api_keys_from_settings()
 
         # Load settings into the sidebar controls
-        self.class_combo.setCurrentText(self.settings.value("class_level", "cm2"))
-        self.topic_edit.setText(self.settings.value("topic", ""))
+        self.class_combo.setCurrentText(self._get_setting("class_level"))
+        self.topic_edit.setText(self._get_setting("topic"))
         
         # Basic settings
-        pages_val = self.settings.value("pages", "")
+        pages_val = self._get_setting("pages")
         if pages_val:
             self.pages_edit.setText(pages_val)
         try:
-            self.duration_spin.setValue(int(self.settings.value("duration", self.settings.value("default_duration", "45"))))
+            self.duration_spin.setValue(int(self._get_setting("duration", self._get_setting("default_duration"))))
         except Exception:
             pass
-        subj = self.settings.value("subject", self.settings.value("default_subject", ""))
+        subj = self._get_setting("subject", self._get_setting("default_subject"))
         if subj is not None:
             self.subject_combo.setCurrentText(subj)
         
-        # Load available lessons from toc_cache
-        self._load_available_lessons()
+        # Lessons for the restored class are picked up by the deferred load queued in _build_main_controls
         # Default template
         try:
-            self.pdf_template_combo.setCurrentText(self.settings.value("default_pdf_style", list(PDF_TEMPLATES.keys())[0]))
+            self.pdf_template_combo.setCurrentText(self._get_setting("default_pdf_style"))
         except Exception:
             pass
         
         # Load window geometry
-        geometry = self.settings.value("window_geometry")
+        geometry = self._get_setting("window_geometry")
         if geometry:
             self.restoreGeometry(geometry)
         
         # Load splitter state
-        splitter_state = self.settings.value("splitter_state")
+        splitter_state = self._get_setting("splitter_state")
         if splitter_state and getattr(self, "main_splitter", None):
             try:
                 self.main_splitter.restoreState(splitter_state)
             except Exception:
                 pass
 
+    def _schedule_save(self, *_):
+        """(Re)start the save debounce; ignores the signal's argument so QTimer.start(int) is never hit."""
+        self._save_timer.start()
+
     def _save_settings(self):
         # Save basic controls
-        self.settings.setValue("class_level", self.class_combo.currentText())
-        self.settings.setValue("topic", self.topic_edit.text())
-        self.settings.setValue("pages", self.pages_edit.text())
-        self.settings.setValue("duration", str(self.duration_spin.value()))
-        self.settings.setValue("subject", self.subject_combo.currentText())
+        values = {
+            "class_level": self.class_combo.currentText(),
+            "topic": self.topic_edit.text(),
+            "pages": self.pages_edit.text(),
+            "duration": str(self.duration_spin.value()),
+            "subject": self.subject_combo.currentText(),
+        }
         
         # Save window state
-        self.settings.setValue("window_geometry", self.saveGeometry())
+        values["window_geometry"] = self.saveGeometry()
         if getattr(self, "main_splitter", None):
             try:
-                self.settings.setValue("splitter_state", self.main_splitter.saveState())
+                values["splitter_state"] = self.main_splitter.saveState()
             except Exception:
                 pass
+        
+        # Only keys that changed since the settings were loaded are queued for the writer thread
+        for key, value in values.items():
+            self._set_setting(key, value)
 
     def closeEvent(self, event):
         """Handle application close with proper cleanup."""
-        # Save settings first
+        # Save settings first, let the writer thread apply and sync them, then flush ours once
+        self._save_timer.stop()
         self._save_settings()
+        self._settings_writer_queue.put(None)
+        self._settings_writer.join(timeout=2)
+        self.settings.sync()
         
         # Cancel and clean up any running worker
         if self.worker is not None and self.worker.isRunning():
@@ -2971,14 +2772,13 @@ Documents/
                 self.worker.terminate()
                 self.worker.wait()
         
-        # Close log file
-        if self.log_file_handle:
-            try:
-                self.log_file_handle.flush()
-                self.log_file_handle.close()
-            except (IOError, OSError):
-                pass
-            finally:
-                self.log_file_handle = None
+        # Let an export in progress finish writing its file
+        if self._export_running():
+            self._export_worker.wait()
+        
+        # Close log file and let the writer thread finish what is queued
+        self._close_log_file()
+        self._log_writer_queue.put(None)
+        self._log_writer.join(timeout=2)
         
         event.accept()
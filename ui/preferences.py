@@ -1,5 +1,6 @@
 from PyQt6 import QtWidgets, QtCore, QtGui
 from config import (
+    SUBJECTS,
     PDF_TEMPLATES,
     DEFAULT_PRO_MODEL,
     DEFAULT_FLASH_MODEL,
@@ -14,6 +15,42 @@ from config import (
     DEFAULT_OUTPUT_DIR
 )
 
+# Choices for the General tab's default PDF style; default subjects come from config.SUBJECTS
+_PDF_TEMPLATE_KEYS = tuple(PDF_TEMPLATES)
+
+# Temperature text for each slider position 0..100 ("0.00".."1.00")
+_TEMP_LABELS = tuple(f"{v/100:.2f}" for v in range(101))
+
+def _spacer():
+    """Blank row for a form layout: a layout item rather than an empty QLabel widget."""
+    return QtWidgets.QSpacerItem(
+        0, 12, QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Fixed
+    )
+
+# Marks a key the dialog never loaded, so _store always writes it
+_UNSET = object()
+
+# QSettings string form of a checkbox state
+_BOOL = {True: "true", False: "false"}
+
+def _qbool(value, default=False):
+    """Checkbox state from a stored value: "true"/"false" strings, or a real bool on native backends."""
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return value == "true"
+    return bool(value)
+
+# Preference tabs in display order: (label, builder, settings loader, settings saver)
+_TABS = (
+    ("General", "_create_general_tab", "_load_general", "_save_general"),
+    ("AI & Models", "_create_ai_tab", "_load_ai", "_save_ai"),
+    ("Folders", "_create_folders_tab", "_load_folders", "_save_folders"),
+    ("Advanced", "_create_advanced_tab", "_load_advanced", "_save_advanced"),
+    ("Appearance", "_create_appearance_tab", "_load_appearance", "_save_appearance"),
+)
+_GENERAL_TAB, _AI_TAB, _FOLDERS_TAB, _ADVANCED_TAB, _APPEARANCE_TAB = range(len(_TABS))
+
 class PreferencesDialog(QtWidgets.QDialog):
     """macOS-style preferences dialog"""
     
@@ -26,25 +63,24 @@ class PreferencesDialog(QtWidgets.QDialog):
         # Create tab widget for different preference categories
         self.tab_widget = QtWidgets.QTabWidget()
         
-        # General tab
-        general_tab = self._create_general_tab()
-        self.tab_widget.addTab(general_tab, "General")
-        
-        # AI & Models tab
-        ai_tab = self._create_ai_tab()
-        self.tab_widget.addTab(ai_tab, "AI & Models")
-        
-        # Folders tab
-        folders_tab = self._create_folders_tab()
-        self.tab_widget.addTab(folders_tab, "Folders")
-
-        # Advanced tab
-        advanced_tab = self._create_advanced_tab()
-        self.tab_widget.addTab(advanced_tab, "Advanced")
-
-        # Appearance tab
-        appearance_tab = self._create_appearance_tab()
-        self.tab_widget.addTab(appearance_tab, "Appearance")
+        # Tabs start as empty placeholders and are built (and loaded, once load_from_settings
+        # has run) the first time they are shown
+        self._tab_builders = {}
+        self._tab_loaders = {}
+        self._tab_savers = {}
+        self._tab_built = set()
+        self._pending_settings = None
+        # Raw values the loaders read, so savers can skip keys whose value did not change
+        self._loaded_values = {}
+        # Prompt texts shown when the prompt editors are first built
+        self._pending_prompts = {}
+        for idx, (label, builder, loader, saver) in enumerate(_TABS):
+            self.tab_widget.addTab(QtWidgets.QWidget(), label)
+            self._tab_builders[idx] = getattr(self, builder)
+            self._tab_loaders[idx] = getattr(self, loader)
+            self._tab_savers[idx] = getattr(self, saver)
+        self._ensure_tab(_GENERAL_TAB)
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
 
         # Layout
         layout = QtWidgets.QVBoxLayout(self)
@@ -59,6 +95,45 @@ class PreferencesDialog(QtWidgets.QDialog):
         button_box.rejected.connect(self.reject)
         layout.addWidget(button_box)
         
+    def _ensure_tab(self, idx):
+        """Build tab idx in place of its placeholder if it has not been built yet."""
+        if idx in self._tab_built or idx not in self._tab_builders:
+            return
+        self._tab_built.add(idx)
+        tabs = self.tab_widget
+        # Build, swap in and load the page with painting off, so it is laid out and drawn once
+        tabs.setUpdatesEnabled(False)
+        try:
+            built = self._tab_builders[idx]()
+            current = tabs.currentIndex()
+            placeholder = tabs.widget(idx)
+            tabs.blockSignals(True)
+            try:
+                tabs.removeTab(idx)
+                tabs.insertTab(idx, built, _TABS[idx][0])
+                tabs.setCurrentIndex(current)
+            finally:
+                tabs.blockSignals(False)
+            placeholder.deleteLater()
+            if self._pending_settings is not None:
+                self._tab_loaders[idx](self._pending_settings)
+        finally:
+            tabs.setUpdatesEnabled(True)
+
+    def _on_tab_changed(self, idx):
+        self._ensure_tab(idx)
+
+    def _value(self, settings, key, default):
+        """settings.value() that remembers what was loaded for _store."""
+        value = settings.value(key, default)
+        self._loaded_values[key] = value
+        return value
+
+    def _store(self, settings, key, value):
+        """settings.setValue() unless value is what the dialog loaded for key."""
+        if self._loaded_values.get(key, _UNSET) != value:
+            settings.setValue(key, value)
+
     def _create_general_tab(self):
         widget = QtWidgets.QWidget()
         layout = QtWidgets.QFormLayout(widget)
@@ -87,14 +162,11 @@ class PreferencesDialog(QtWidgets.QDialog):
         layout.addRow("Default Duration:", self.default_duration_spin)
 
         self.default_pdf_style_combo = QtWidgets.QComboBox()
-        self.default_pdf_style_combo.addItems(list(PDF_TEMPLATES.keys()))
+        self.default_pdf_style_combo.addItems(_PDF_TEMPLATE_KEYS)
         layout.addRow("Default PDF Style:", self.default_pdf_style_combo)
 
         self.default_subject_combo = QtWidgets.QComboBox()
-        self.default_subject_combo.addItems([
-            "", "Mathématiques", "Sciences", "Français", "Histoire", 
-            "Géographie", "Éducation civique", "Arabe", "Anglais", "Islamique"
-        ])
+        self.default_subject_combo.addItems(SUBJECTS)
         layout.addRow("Default Subject:", self.default_subject_combo)
         
         return widget
@@ -125,9 +197,7 @@ class PreferencesDialog(QtWidgets.QDialog):
         show_gemini_btn = QtWidgets.QPushButton("👁")
         show_gemini_btn.setMaximumWidth(30)
         show_gemini_btn.setCheckable(True)
-        show_gemini_btn.toggled.connect(lambda checked: self.gemini_key_edit.setEchoMode(
-            QtWidgets.QLineEdit.EchoMode.Normal if checked else QtWidgets.QLineEdit.EchoMode.Password
-        ))
+        show_gemini_btn.toggled.connect(self._on_show_gemini_toggled)
         
         gemini_widget = QtWidgets.QWidget()
         gemini_layout = QtWidgets.QHBoxLayout(gemini_widget)
@@ -137,7 +207,7 @@ class PreferencesDialog(QtWidgets.QDialog):
         layout.addRow("Gemini Key:", gemini_widget)
         
         # Add some spacing
-        layout.addRow("", QtWidgets.QLabel(""))
+        layout.addItem(_spacer())
         
         # Temperature slider
         temp_label_header = QtWidgets.QLabel("<b>Generation Settings</b>")
@@ -150,8 +220,8 @@ class PreferencesDialog(QtWidgets.QDialog):
         self.temp_slider = QtWidgets.QSlider(QtCore.Qt.Orientation.Horizontal)
         self.temp_slider.setRange(0, 100)
         self.temp_slider.setValue(50)
-        self.temp_label = QtWidgets.QLabel("0.50")
-        self.temp_slider.valueChanged.connect(lambda v: self.temp_label.setText(f"{v/100:.2f}"))
+        self.temp_label = QtWidgets.QLabel(_TEMP_LABELS[50])
+        self.temp_slider.valueChanged.connect(self._on_temp_changed)
         
         temp_layout.addWidget(self.temp_slider, 1)
         temp_layout.addWidget(self.temp_label)
@@ -159,6 +229,16 @@ class PreferencesDialog(QtWidgets.QDialog):
         
         return widget
         
+    @QtCore.pyqtSlot(bool)
+    def _on_show_gemini_toggled(self, checked):
+        self.gemini_key_edit.setEchoMode(
+            QtWidgets.QLineEdit.EchoMode.Normal if checked else QtWidgets.QLineEdit.EchoMode.Password
+        )
+
+    @QtCore.pyqtSlot(int)
+    def _on_temp_changed(self, value):
+        self.temp_label.setText(_TEMP_LABELS[value])
+        
     def _create_folders_tab(self):
         widget = QtWidgets.QWidget()
         layout = QtWidgets.QFormLayout(widget)
@@ -233,7 +313,7 @@ class PreferencesDialog(QtWidgets.QDialog):
         self.enable_fallback_chk.setChecked(True)
         model_layout.addRow("", self.enable_fallback_chk)
         
-        model_layout.addRow(QtWidgets.QLabel(""))  # Spacer
+        model_layout.addItem(_spacer())
         model_layout.addRow(QtWidgets.QLabel("🔧 Utility Models:"))
         
         # Gemini models (keep existing but updated labels)
@@ -274,8 +354,31 @@ class PreferencesDialog(QtWidgets.QDialog):
         self.enable_prompt_editing_chk.toggled.connect(self._toggle_prompt_editing)
         prompt_layout.addWidget(self.enable_prompt_editing_chk)
         
-        # Prompt editing area (initially hidden)
+        # Prompt editing area (initially hidden); its editors are built on first reveal
         self.prompt_editing_widget = QtWidgets.QWidget()
+        self.toc_prompt_edit = None
+        self.page_finding_prompt_edit = None
+        self.fiche_prompt_edit = None
+        
+        self.prompt_editing_widget.setVisible(False)  # Initially hidden
+        prompt_layout.addWidget(self.prompt_editing_widget)
+        
+        layout.addWidget(prompt_group)
+        
+        layout.addStretch(1)
+        return widget
+    
+    def _ensure_prompt_widgets(self):
+        """Build the prompt editors the first time prompt editing is enabled."""
+        if self.toc_prompt_edit is not None:
+            return
+        self.prompt_editing_widget.setUpdatesEnabled(False)
+        try:
+            self._build_prompt_widgets()
+        finally:
+            self.prompt_editing_widget.setUpdatesEnabled(True)
+    
+    def _build_prompt_widgets(self):
         prompt_edit_layout = QtWidgets.QVBoxLayout(self.prompt_editing_widget)
         prompt_edit_layout.setContentsMargins(0, 0, 0, 0)
         
@@ -288,21 +391,21 @@ class PreferencesDialog(QtWidgets.QDialog):
         prompt_edit_layout.addWidget(QtWidgets.QLabel("Table of Contents Parsing Prompt:"))
         self.toc_prompt_edit = QtWidgets.QTextEdit()
         self.toc_prompt_edit.setMaximumHeight(150)
-        self.toc_prompt_edit.setPlaceholderText("Prompt for parsing PDF table of contents...")
+        self.toc_prompt_edit.setPlaceholderText("Default ToC parsing prompt will be used if empty")
         prompt_edit_layout.addWidget(self.toc_prompt_edit)
         
         # Page finding prompt
         prompt_edit_layout.addWidget(QtWidgets.QLabel("Page Finding Prompt:"))
         self.page_finding_prompt_edit = QtWidgets.QTextEdit()
         self.page_finding_prompt_edit.setMaximumHeight(150)
-        self.page_finding_prompt_edit.setPlaceholderText("Prompt for finding specific lesson pages...")
+        self.page_finding_prompt_edit.setPlaceholderText("Default page finding prompt will be used if empty")
         prompt_edit_layout.addWidget(self.page_finding_prompt_edit)
         
         # Fiche generation prompt
         prompt_edit_layout.addWidget(QtWidgets.QLabel("Fiche Generation Prompt:"))
         self.fiche_prompt_edit = QtWidgets.QTextEdit()
         self.fiche_prompt_edit.setMaximumHeight(200)
-        self.fiche_prompt_edit.setPlaceholderText("Main prompt for generating pedagogical fiches...")
+        self.fiche_prompt_edit.setPlaceholderText("Default fiche generation prompt will be used if empty")
         prompt_edit_layout.addWidget(self.fiche_prompt_edit)
         
         # Reset to defaults button
@@ -310,16 +413,19 @@ class PreferencesDialog(QtWidgets.QDialog):
         reset_btn.clicked.connect(self._reset_prompts_to_defaults)
         prompt_edit_layout.addWidget(reset_btn)
         
-        self.prompt_editing_widget.setVisible(False)  # Initially hidden
-        prompt_layout.addWidget(self.prompt_editing_widget)
-        
-        layout.addWidget(prompt_group)
-        
-        layout.addStretch(1)
-        return widget
+        self._fill_prompt_widgets()
+    
+    def _fill_prompt_widgets(self):
+        """Show the prompts read by _load_advanced in the editors."""
+        prompts = self._pending_prompts
+        self.toc_prompt_edit.setPlainText(prompts.get("advanced_toc_prompt", ""))
+        self.page_finding_prompt_edit.setPlainText(prompts.get("advanced_page_finding_prompt", ""))
+        self.fiche_prompt_edit.setPlainText(prompts.get("advanced_fiche_prompt", ""))
     
     def _toggle_prompt_editing(self, enabled):
         """Show/hide the prompt editing interface"""
+        if enabled:
+            self._ensure_prompt_widgets()
         self.prompt_editing_widget.setVisible(enabled)
         
     def _reset_prompts_to_defaults(self):
@@ -342,6 +448,7 @@ class PreferencesDialog(QtWidgets.QDialog):
         self.language_combo = QtWidgets.QComboBox()
         self.language_combo.addItem("English", "en")
         self.language_combo.addItem("Français", "fr")
+        self._lang_code_to_index = {"en": 0, "fr": 1}
         self.language_combo.setToolTip("Change the interface language (requires restart)")
         form.addRow("Language / Langue:", self.language_combo)
         
@@ -381,105 +488,123 @@ class PreferencesDialog(QtWidgets.QDialog):
             self.output_edit.setText(folder)
             
     def load_from_settings(self, settings):
-        """Load preferences from QSettings"""
-        # Load API keys
-        self.gemini_key_edit.setText(settings.value("gemini_api_key", ""))
-        
-        # Load other settings
-        self.input_edit.setText(settings.value("input_dir", DEFAULT_INPUT_DIR))
-        self.textbook_edit.setText(settings.value("textbook_dir", ""))
-        self.output_edit.setText(settings.value("output_dir", DEFAULT_OUTPUT_DIR))
-        self.temp_slider.setValue(int(float(settings.value("temperature", "0.5")) * 100))
-        self.use_top_examples_chk.setChecked(settings.value("use_top_examples", "true") == "true")
-        self.save_logs_chk.setChecked(settings.value("save_logs", "false") == "true")
-        self.preview_source_chk.setChecked(settings.value("preview_source", "false") == "true")
-        self.special_instructions_edit.setText(settings.value("special_instructions", ""))
-        self.compact_sidebar_chk.setChecked(settings.value("ui_compact_sidebar", "false") == "true")
-        self.pdf_meta_banner_chk.setChecked(settings.value("pdf_show_meta", "false") == "true")
-        
-        # Load language setting
-        lang_code = settings.value("ui_language", "fr")  # Default to French for your mom
-        for i in range(self.language_combo.count()):
-            if self.language_combo.itemData(i) == lang_code:
-                self.language_combo.setCurrentIndex(i)
-                break
+        """Load preferences from QSettings into the built tabs; the others load when first shown"""
+        self._pending_settings = settings
+        for idx in sorted(self._tab_built):
+            self._tab_loaders[idx](settings)
+
+    def _load_general(self, settings):
+        self.use_top_examples_chk.setChecked(_qbool(self._value(settings, "use_top_examples", "true")))
+        self.save_logs_chk.setChecked(_qbool(self._value(settings, "save_logs", "false")))
+        self.preview_source_chk.setChecked(_qbool(self._value(settings, "preview_source", "false")))
         
         # Defaults
-        self.default_duration_spin.setValue(int(settings.value("default_duration", "45")))
-        self.default_pdf_style_combo.setCurrentText(settings.value("default_pdf_style", list(PDF_TEMPLATES.keys())[0]))
-        self.default_subject_combo.setCurrentText(settings.value("default_subject", ""))
+        self.default_duration_spin.setValue(int(self._value(settings, "default_duration", "45")))
+        self.default_pdf_style_combo.setCurrentText(self._value(settings, "default_pdf_style", _PDF_TEMPLATE_KEYS[0]))
+        self.default_subject_combo.setCurrentText(self._value(settings, "default_subject", ""))
+
+    def _load_ai(self, settings):
+        # Load API keys
+        self.gemini_key_edit.setText(self._value(settings, "gemini_api_key", ""))
+        self.temp_slider.setValue(int(float(self._value(settings, "temperature", "0.5")) * 100))
+
+    def _load_folders(self, settings):
+        self.input_edit.setText(self._value(settings, "input_dir", DEFAULT_INPUT_DIR))
+        self.textbook_edit.setText(self._value(settings, "textbook_dir", ""))
+        self.output_edit.setText(self._value(settings, "output_dir", DEFAULT_OUTPUT_DIR))
+
+    def _load_advanced(self, settings):
+        self.special_instructions_edit.setText(self._value(settings, "special_instructions", ""))
         
         # Load Pro/Flash model configuration
-        self.pro_model_edit.setText(settings.value("custom_pro_model", DEFAULT_PRO_MODEL))
-        self.flash_model_edit.setText(settings.value("custom_flash_model", DEFAULT_FLASH_MODEL))
-        self.enable_fallback_chk.setChecked(settings.value("enable_model_fallback", "true") == "true")
+        self.pro_model_edit.setText(self._value(settings, "custom_pro_model", DEFAULT_PRO_MODEL))
+        self.flash_model_edit.setText(self._value(settings, "custom_flash_model", DEFAULT_FLASH_MODEL))
+        self.enable_fallback_chk.setChecked(_qbool(self._value(settings, "enable_model_fallback", "true")))
         
         # Load advanced model configuration
-        self.gemini_model_edit.setText(settings.value("advanced_gemini_model", GEMINI_MODEL))
-        self.gemini_toc_model_edit.setText(settings.value("advanced_gemini_toc_model", GEMINI_TOC_MODEL))
-        self.gemini_offset_model_edit.setText(settings.value("advanced_gemini_offset_model", GEMINI_OFFSET_MODEL))
-        self.gemma_syntax_model_edit.setText(settings.value("advanced_gemma_syntax_model", GEMMA_SYNTAX_MODEL))
+        self.gemini_model_edit.setText(self._value(settings, "advanced_gemini_model", GEMINI_MODEL))
+        self.gemini_toc_model_edit.setText(self._value(settings, "advanced_gemini_toc_model", GEMINI_TOC_MODEL))
+        self.gemini_offset_model_edit.setText(self._value(settings, "advanced_gemini_offset_model", GEMINI_OFFSET_MODEL))
+        self.gemma_syntax_model_edit.setText(self._value(settings, "advanced_gemma_syntax_model", GEMMA_SYNTAX_MODEL))
         
         # OpenRouter removed - no longer used
         
         # Load prompt editing settings
-        self.enable_prompt_editing_chk.setChecked(settings.value("advanced_enable_prompt_editing", "false") == "true")
-        
-        # Load prompts, showing defaults as placeholders if custom prompts are empty
-        toc_prompt = settings.value("advanced_toc_prompt", "").strip()
-        page_prompt = settings.value("advanced_page_finding_prompt", "").strip()
-        fiche_prompt = settings.value("advanced_fiche_prompt", "").strip()
-        
-        self.toc_prompt_edit.setPlainText(toc_prompt if toc_prompt else "")
-        self.toc_prompt_edit.setPlaceholderText("Default ToC parsing prompt will be used if empty")
-        
-        self.page_finding_prompt_edit.setPlainText(page_prompt if page_prompt else "")
-        self.page_finding_prompt_edit.setPlaceholderText("Default page finding prompt will be used if empty")
+        self.enable_prompt_editing_chk.setChecked(_qbool(self._value(settings, "advanced_enable_prompt_editing", "false")))
         
-        self.fiche_prompt_edit.setPlainText(fiche_prompt if fiche_prompt else "")
-        self.fiche_prompt_edit.setPlaceholderText("Default fiche generation prompt will be used if empty")
+        # Load prompts; the editors show them once built, empty meaning the default prompt
+        self._pending_prompts = {
+            key: self._value(settings, key, "").strip()
+            for key in ("advanced_toc_prompt", "advanced_page_finding_prompt", "advanced_fiche_prompt")
+        }
+        if self.toc_prompt_edit is not None:
+            self._fill_prompt_widgets()
         
         # Update prompt editing visibility
         self._toggle_prompt_editing(self.enable_prompt_editing_chk.isChecked())
         
         self._on_provider_change("")
+
+    def _load_appearance(self, settings):
+        self.compact_sidebar_chk.setChecked(_qbool(self._value(settings, "ui_compact_sidebar", "false")))
+        self.pdf_meta_banner_chk.setChecked(_qbool(self._value(settings, "pdf_show_meta", "false")))
+        
+        # Load language setting
+        lang_code = self._value(settings, "ui_language", "fr")  # Default to French for your mom
+        idx = self._lang_code_to_index.get(lang_code)
+        if idx is not None:
+            self.language_combo.setCurrentIndex(idx)
         
     def save_to_settings(self, settings):
-        """Save preferences to QSettings"""
+        """Save preferences to QSettings; tabs never opened keep their stored values"""
+        for idx in sorted(self._tab_built):
+            self._tab_savers[idx](settings)
+        # Flush the whole batch to the backing store once
+        settings.sync()
+
+    def _save_general(self, settings):
+        self._store(settings, "use_top_examples", _BOOL[self.use_top_examples_chk.isChecked()])
+        self._store(settings, "save_logs", _BOOL[self.save_logs_chk.isChecked()])
+        self._store(settings, "preview_source", _BOOL[self.preview_source_chk.isChecked()])
+        self._store(settings, "default_duration", str(self.default_duration_spin.value()))
+        self._store(settings, "default_pdf_style", self.default_pdf_style_combo.currentText())
+        self._store(settings, "default_subject", self.default_subject_combo.currentText())
+
+    def _save_ai(self, settings):
         # Save API keys
-        settings.setValue("gemini_api_key", self.gemini_key_edit.text())
-        
-        # Save other settings
-        settings.setValue("input_dir", self.input_edit.text() or DEFAULT_INPUT_DIR)
-        settings.setValue("textbook_dir", self.textbook_edit.text())
-        settings.setValue("output_dir", self.output_edit.text() or DEFAULT_OUTPUT_DIR)
-        settings.setValue("temperature", f"{self.temp_slider.value()/100:.2f}")
-        settings.setValue("use_top_examples", "true" if self.use_top_examples_chk.isChecked() else "false")
-        settings.setValue("save_logs", "true" if self.save_logs_chk.isChecked() else "false")
-        settings.setValue("preview_source", "true" if self.preview_source_chk.isChecked() else "false")
-        settings.setValue("special_instructions", self.special_instructions_edit.toPlainText())
-        settings.setValue("ui_compact_sidebar", "true" if self.compact_sidebar_chk.isChecked() else "false")
-        settings.setValue("pdf_show_meta", "true" if self.pdf_meta_banner_chk.isChecked() else "false")
-        settings.setValue("ui_language", self.language_combo.currentData())
-        settings.setValue("default_duration", str(self.default_duration_spin.value()))
-        settings.setValue("default_pdf_style", self.default_pdf_style_combo.currentText())
-        settings.setValue("default_subject", self.default_subject_combo.currentText())
+        self._store(settings, "gemini_api_key", self.gemini_key_edit.text())
+        self._store(settings, "temperature", _TEMP_LABELS[self.temp_slider.value()])
+
+    def _save_folders(self, settings):
+        self._store(settings, "input_dir", self.input_edit.text() or DEFAULT_INPUT_DIR)
+        self._store(settings, "textbook_dir", self.textbook_edit.text())
+        self._store(settings, "output_dir", self.output_edit.text() or DEFAULT_OUTPUT_DIR)
+
+    def _save_advanced(self, settings):
+        self._store(settings, "special_instructions", self.special_instructions_edit.toPlainText())
         
         # Save Pro/Flash model configuration
         pro_model = self.pro_model_edit.text().strip() or DEFAULT_PRO_MODEL
         flash_model = self.flash_model_edit.text().strip() or DEFAULT_FLASH_MODEL
-        settings.setValue("custom_pro_model", pro_model)
-        settings.setValue("custom_flash_model", flash_model)
-        settings.setValue("enable_model_fallback", "true" if self.enable_fallback_chk.isChecked() else "false")
+        self._store(settings, "custom_pro_model", pro_model)
+        self._store(settings, "custom_flash_model", flash_model)
+        self._store(settings, "enable_model_fallback", _BOOL[self.enable_fallback_chk.isChecked()])
         
         # Save advanced model configuration
-        settings.setValue("advanced_gemini_model", self.gemini_model_edit.text())
-        settings.setValue("advanced_gemini_toc_model", self.gemini_toc_model_edit.text())
-        settings.setValue("advanced_gemini_offset_model", self.gemini_offset_model_edit.text())
-        settings.setValue("advanced_gemma_syntax_model", self.gemma_syntax_model_edit.text())
+        self._store(settings, "advanced_gemini_model", self.gemini_model_edit.text())
+        self._store(settings, "advanced_gemini_toc_model", self.gemini_toc_model_edit.text())
+        self._store(settings, "advanced_gemini_offset_model", self.gemini_offset_model_edit.text())
+        self._store(settings, "advanced_gemma_syntax_model", self.gemma_syntax_model_edit.text())
         
         # Save prompt editing settings
-        settings.setValue("advanced_enable_prompt_editing", "true" if self.enable_prompt_editing_chk.isChecked() else "false")
-        settings.setValue("advanced_toc_prompt", self.toc_prompt_edit.toPlainText())
-        settings.setValue("advanced_page_finding_prompt", self.page_finding_prompt_edit.toPlainText())
-        settings.setValue("advanced_fiche_prompt", self.fiche_prompt_edit.toPlainText())
+        self._store(settings, "advanced_enable_prompt_editing", _BOOL[self.enable_prompt_editing_chk.isChecked()])
+        # Prompts left unbuilt were never edited, so their stored values stand
+        if self.toc_prompt_edit is not None:
+            self._store(settings, "advanced_toc_prompt", self.toc_prompt_edit.toPlainText())
+            self._store(settings, "advanced_page_finding_prompt", self.page_finding_prompt_edit.toPlainText())
+            self._store(settings, "advanced_fiche_prompt", self.fiche_prompt_edit.toPlainText())
+
+    def _save_appearance(self, settings):
+        self._store(settings, "ui_compact_sidebar", _BOOL[self.compact_sidebar_chk.isChecked()])
+        self._store(settings, "pdf_show_meta", _BOOL[self.pdf_meta_banner_chk.isChecked()])
+        self._store(settings, "ui_language", self.language_combo.currentData())
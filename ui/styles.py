@@ -60,6 +60,12 @@ QTextEdit {
 }
 """
 
+# MACOS_POLISH without comment lines and indentation, computed once; this is what Qt parses
+_COMPILED_STYLESHEET = "\n".join(
+    line.strip() for line in MACOS_POLISH.splitlines()
+    if line.strip() and not line.strip().startswith("/*")
+)
+
 # Light theme - minimal customization
 MACOS_LIGHT = MACOS_POLISH
 
@@ -78,4 +84,4 @@ def get_stylesheet(theme="system"):
         Stylesheet string (minimal polish or empty)
     """
     # Return minimal polish - works for both light and dark
-    return MACOS_POLISH
+    return _COMPILED_STYLESHEET
@@ -1,37 +1,56 @@
 import os
 import json
+import functools
+import heapq
+import threading
+from types import MappingProxyType
 from typing import Optional, List, Dict, Any
-from reportlab.lib import colors
-from config import RATINGS_FILE
+from config import RATINGS_FILE, LEGACY_RATINGS_FILE
 
 def _clamp_temperature(value: Optional[float]) -> float:
     if value is None:
         return 0.5
     return max(0.0, min(1.0, float(value)))
 
+# reportlab is only needed once a PDF is rendered, so it is imported on first use
+_colors = None
+
+def _get_colors():
+    """Return reportlab.lib.colors, importing it on the first call."""
+    global _colors
+    if _colors is None:
+        from reportlab.lib import colors
+        _colors = colors
+    return _colors
+
+@functools.lru_cache(maxsize=128)
+def _parse_hex(value: str):
+    """ReportLab color for a hex string; templates reuse a handful of colors, so this is cached."""
+    return _get_colors().toColor(value)
+
 def safe_color(color_value, default='#2E8B57'):
     """Safely convert a color value to a ReportLab color object, with fallback to default."""
     if color_value is None:
         color_value = default
     
     try:
-        # If it's already a color object, return it
-        if hasattr(color_value, 'red'):
-            return color_value
-        
-        # Convert string to color
+        # Hex strings from the templates are the common case
         if isinstance(color_value, str):
             color_value = color_value.strip()
             # Ensure it's a valid hex color
             if not color_value.startswith('#'):
                 color_value = default
-            return colors.toColor(color_value)
+            return _parse_hex(color_value)
+        
+        # If it's already a color object, return it
+        if isinstance(color_value, _get_colors().Color):
+            return color_value
         
         # For any other type, use default
-        return colors.toColor(default)
+        return _parse_hex(default)
     except Exception:
         # If anything fails, return the default color
-        return colors.toColor(default)
+        return _parse_hex(default)
 
 # --- Ratings persistence helpers ---
 def _ensure_ratings_dir() -> bool:
@@ -39,79 +58,179 @@ def _ensure_ratings_dir() -> bool:
     try:
         os.makedirs(os.path.dirname(RATINGS_FILE), exist_ok=True)
         return True
-    except (OSError, PermissionError):
+    except OSError:
         return False
 
-def load_ratings() -> List[Dict[str, Any]]:
-    """Load ratings from JSON file with error recovery."""
-    if not os.path.exists(RATINGS_FILE):
-        return []
-    
-    try:
-        with open(RATINGS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            # Validate it's a list
-            return data if isinstance(data, list) else []
-    except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError, IOError):
-        # If file is corrupted, try to recover by backing it up
-        try:
-            backup_path = f"{RATINGS_FILE}.backup"
-            if os.path.exists(RATINGS_FILE):
-                os.rename(RATINGS_FILE, backup_path)
-        except (OSError, PermissionError):
-            pass
-        return []
+def _rating_line(record: Dict[str, Any]) -> str:
+    """One compact JSON Lines entry for a rating record."""
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
 
-def save_rating_record(record: Dict[str, Any]) -> bool:
-    """Save rating record with atomic write to prevent corruption."""
-    if not _ensure_ratings_dir():
-        return False
-    
-    data = load_ratings()
-    data.append(record)
+_legacy_migrated = False
+
+def _migrate_legacy_ratings() -> None:
+    """Convert the old JSON-array ratings file to JSON Lines, once per session."""
+    global _legacy_migrated
+    if _legacy_migrated:
+        return
+    _legacy_migrated = True
+    if os.path.exists(RATINGS_FILE) or not os.path.exists(LEGACY_RATINGS_FILE):
+        return
     
-    # Write to temporary file first (atomic operation)
     temp_file = f"{RATINGS_FILE}.tmp"
     try:
+        with open(LEGACY_RATINGS_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
         with open(temp_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        
-        # Atomic rename (on POSIX systems)
+            for record in data if isinstance(data, list) else []:
+                f.write(_rating_line(record))
         os.replace(temp_file, RATINGS_FILE)
-        return True
-    except (IOError, OSError, PermissionError) as e:
-        # Clean up temp file if it exists
+    except (json.JSONDecodeError, UnicodeDecodeError, OSError):
+        # Leave the legacy file alone; new ratings simply start a fresh JSONL file
         try:
             if os.path.exists(temp_file):
                 os.remove(temp_file)
-        except (OSError, PermissionError):
+        except OSError:
             pass
+
+# Parsed ratings keyed by the file's signature, shared by the UI and worker threads
+_ratings_cache = {"signature": None, "data": None, "skipped": 0}
+_ratings_lock = threading.Lock()
+
+def _ratings_signature() -> Optional[tuple]:
+    """(mtime_ns, size) of the ratings file, or None if it is missing.
+
+    Size is included because two appends can land within the filesystem's timestamp resolution.
+    """
+    try:
+        st = os.stat(RATINGS_FILE)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def load_ratings() -> List[Dict[str, Any]]:
+    """Load ratings from the JSON Lines file with error recovery.
+
+    The parsed list is cached until the file's signature changes; callers must not mutate it.
+    """
+    return _load_ratings_versioned()[1]
+
+def _load_ratings_versioned():
+    """Return (file signature, ratings) from one stat, parsing the file only when it changed."""
+    _migrate_legacy_ratings()
+    with _ratings_lock:
+        signature = _ratings_signature()
+        if signature is not None and signature == _ratings_cache["signature"]:
+            return signature, _ratings_cache["data"]
+        _ratings_cache["signature"] = _ratings_cache["data"] = None
+        _ratings_cache["skipped"] = 0
+        
+        data = []
+        bad_lines = 0
+        try:
+            with open(RATINGS_FILE, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    # A damaged line (e.g. a write cut short) is skipped; save_rating_record
+                    # terminates it before appending, so later records stay on lines of their own
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        bad_lines += 1
+                        continue
+                    # Valid JSON that is not an object cannot be a rating record
+                    if isinstance(record, dict):
+                        data.append(record)
+                    else:
+                        bad_lines += 1
+        except OSError:
+            # No ratings yet (FileNotFoundError) or the file cannot be read
+            return None, []
+        if bad_lines and not data:
+            # Nothing readable at all: set the file aside and start afresh
+            try:
+                os.rename(RATINGS_FILE, f"{RATINGS_FILE}.backup")
+            except OSError:
+                pass
+            return None, []
+        _ratings_cache["signature"] = signature
+        _ratings_cache["data"] = data
+        _ratings_cache["skipped"] = bad_lines
+        return signature, data
+
+def skipped_rating_lines() -> int:
+    """Number of corrupt lines the last parse of the ratings file skipped."""
+    return _ratings_cache["skipped"]
+
+def save_rating_record(record: Dict[str, Any]) -> bool:
+    """Append one rating record as a single JSON line."""
+    if not _ensure_ratings_dir():
         return False
+    _migrate_legacy_ratings()
+    
+    with _ratings_lock:
+        signature = _ratings_signature()
+        try:
+            with open(RATINGS_FILE, "a+b") as f:
+                line = _rating_line(record)
+                # If the last line was cut short, terminate it so the new record starts a line of its own
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        line = "\n" + line
+                f.write(line.encode("utf-8"))
+                # Make the appended line durable before reporting success
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError:
+            return False
+        # Keep the cached list current instead of re-parsing the file on the next load
+        if _ratings_cache["data"] is not None and _ratings_cache["signature"] == signature:
+            _ratings_cache["data"].append(record)
+            _ratings_cache["signature"] = _ratings_signature()
+        return True
+
+# (n, min_chars, ratings file signature) -> read-only examples; a changed ratings file changes the key
+_top_examples_cache = {}
+_TOP_EXAMPLES_CACHE_SIZE = 8
 
 def get_top_rated_examples(n: int = 2, min_chars: int = 400) -> List[Dict[str, str]]:
     """
     Get top-rated fiche examples for prompt construction.
     
+    Results are memoized per ratings file version, so repeated generations reuse them.
+    
     Args:
         n: Maximum number of examples to return
         min_chars: Minimum content length to qualify
     
     Returns:
-        List of dicts with keys: topic, class_level, content
+        List of read-only mappings with keys: topic, class_level, content
     """
-    data = load_ratings()
-    # Sort by rating (desc) then timestamp (newest first)
-    data.sort(key=lambda r: (r.get("rating", 0), r.get("timestamp", "")), reverse=True)
+    # The key uses the same signature load_ratings validated its cache with
+    signature, ratings = _load_ratings_versioned()
+    key = (n, min_chars, signature)
+    cached = _top_examples_cache.get(key)
+    if cached is not None:
+        return list(cached)
     
-    examples = []
-    for r in data:
-        content = r.get("content", "")
-        if len(content) >= min_chars:
-            examples.append({
-                "topic": r.get("topic", "Unknown"),
-                "class_level": r.get("class_level", "Unknown"),
-                "content": content
-            })
-            if len(examples) >= n:
-                break
-    return examples
+    # Highest rating first, then newest; nlargest only keeps the n best long-enough entries
+    # and, unlike sort(), leaves load_ratings' shared list untouched
+    top = heapq.nlargest(
+        n,
+        (r for r in ratings if len(r.get("content", "")) >= min_chars),
+        key=lambda r: (r.get("rating", 0), r.get("timestamp", "")),
+    )
+    examples = tuple(
+        MappingProxyType({
+            "topic": r.get("topic", "Unknown"),
+            "class_level": r.get("class_level", "Unknown"),
+            "content": r.get("content", "")
+        })
+        for r in top
+    )
+    if len(_top_examples_cache) >= _TOP_EXAMPLES_CACHE_SIZE:
+        # Drop the oldest entry
+        _top_examples_cache.pop(next(iter(_top_examples_cache)), None)
+    _top_examples_cache[key] = examples
+    return list(examples)